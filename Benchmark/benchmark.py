@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmark das operações de Grafo (Roteiro2, Roteiro3 e Roteiro5) e do dijkstra do Roteiro7 em famílias de grafos sintéticos.
+
+Uso:
+    python Benchmark/benchmark.py --tamanhos 100 1000 --saida resultados.json
+    python Benchmark/benchmark.py --saida novo.json --comparar resultados.json
+
+Cada resultado guarda o tempo de todas as repetições, o mínimo e a mediana. Com --comparar, as medianas são comparadas com as
+de um arquivo gerado antes, e o programa termina com código 1 se alguma operação ficou mais lenta que a tolerância.
+'''
+import argparse
+import gc
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from instrumentacao import Instrumentacao
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# O dijkstra do Roteiro7 lê os vértices de uma aresta X-Y como os caracteres aresta[0] e aresta[2], então os vértices recebem
+# nomes de um único caractere enquanto couberem neste intervalo do Unicode
+PRIMEIRO_CARACTERE = 0x4E00
+QTDE_CARACTERES = 20000
+
+FAMILIAS = ('caminho', 'grade', 'gnp', 'lei_de_potencia', 'completo')
+
+# Limites acima dos quais uma operação é ignorada por ser lenta demais
+LIMITE_MATRIZ = 3000
+LIMITE_ROTEIRO7 = 5 * 10 ** 6
+
+
+def carrega_modulo(nome, caminho):
+    '''
+    Importa um módulo a partir do caminho do arquivo, já que os roteiros não formam um pacote.
+    '''
+    especificacao = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(modulo)
+    return modulo
+
+
+def carrega_dijkstra_roteiro7():
+    '''
+    Executa apenas a célula do caderno do Roteiro7 que define a função dijkstra.
+    :return: A função dijkstra(vertices, arestas, origem, destino) do caderno.
+    '''
+    with open(os.path.join(RAIZ, 'Roteiro7', 'roteiro7.ipynb'), encoding='utf-8') as arquivo:
+        caderno = json.load(arquivo)
+    for celula in caderno['cells']:
+        codigo = ''.join(celula['source'])
+        if celula['cell_type'] == 'code' and codigo.lstrip().startswith('def dijkstra('):
+            contexto = {}
+            exec(codigo, contexto)
+            return contexto['dijkstra']
+    raise RuntimeError('O caderno do Roteiro7 não define dijkstra')
+
+
+# Geradores: cada um recebe o número aproximado de vértices e um gerador de números aleatórios e retorna a quantidade de
+# vértices e a lista de arestas como pares de índices
+
+def gera_caminho(n, gerador):
+    return n, [(i, i + 1) for i in range(n - 1)]
+
+
+def gera_grade(n, gerador):
+    lado = max(1, math.isqrt(n))
+    arestas = []
+    for i in range(lado):
+        for j in range(lado):
+            v = i * lado + j
+            if j + 1 < lado:
+                arestas.append((v, v + 1))
+            if i + 1 < lado:
+                arestas.append((v, v + lado))
+    return lado * lado, arestas
+
+
+def gera_gnp(n, gerador, grau_medio=8):
+    '''
+    Grafo aleatório G(n, p) com p = grau_medio / (n - 1). Em vez de sortear cada um dos n² pares, sorteia o salto geométrico até
+    o próximo par presente (Batagelj e Brandes), em O(n + E).
+    '''
+    p = min(1.0, grau_medio / max(1, n - 1))
+    if p >= 1:
+        return gera_completo(n, gerador)
+    arestas = []
+    log_q = math.log(1 - p)
+    v, w = 1, -1
+    while v < n:
+        w += 1 + int(math.log(1 - gerador.random()) / log_q)
+        while w >= v and v < n:
+            w -= v
+            v += 1
+        if v < n:
+            arestas.append((v, w))
+    return n, arestas
+
+
+def gera_lei_de_potencia(n, gerador, m=3):
+    '''
+    Grafo de Barabási-Albert: cada vértice novo se liga a até m vértices escolhidos com probabilidade proporcional ao grau,
+    sorteando posições de uma lista em que cada vértice aparece uma vez por aresta.
+    '''
+    m = max(1, min(m, n - 1))
+    arestas = []
+    repetidos = []
+    alvos = list(range(m))
+    for v in range(m, n):
+        for u in set(alvos):
+            arestas.append((u, v))
+        repetidos.extend(alvos)
+        repetidos.extend([v] * m)
+        alvos = [gerador.choice(repetidos) for _ in range(m)]
+    return n, arestas
+
+
+def gera_completo(n, gerador):
+    return n, [(i, j) for i in range(n) for j in range(i + 1, n)]
+
+
+GERADORES = {
+    'caminho': gera_caminho,
+    'grade': gera_grade,
+    'gnp': gera_gnp,
+    'lei_de_potencia': gera_lei_de_potencia,
+    'completo': gera_completo,
+}
+
+
+def nomes_vertices(n):
+    if n <= QTDE_CARACTERES:
+        return [chr(PRIMEIRO_CARACTERE + i) for i in range(n)]
+    return ['v' + str(i) for i in range(n)]
+
+
+def cronometra(funcao, repeticoes, preparo=None):
+    '''
+    Executa a função repeticoes vezes.
+    :param preparo: Opcional. Uma função chamada antes de cada execução, fora da medição, cujo resultado é passado para funcao.
+    Com ela cada repetição roda sobre um grafo novo, e não sobre os caches preenchidos pela repetição anterior (as componentes
+    conexas mantidas por conexo e eh_conexo e o vetor de graus do Roteiro5, por exemplo).
+    :return: Uma tupla (tempos em segundos, valor retornado pela última execução).
+    '''
+    tempos = []
+    valor = None
+    for _ in range(repeticoes):
+        argumentos = () if preparo is None else (preparo(),)
+        inicio = time.perf_counter()
+        valor = funcao(*argumentos)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos, valor
+
+
+def operacoes(modulos, N, pares, pesos):
+    '''
+    Monta, para cada implementação, a função que constrói o grafo e as operações medidas sobre ele. Cada repetição de uma
+    operação recebe um grafo recém-construído.
+    :return: Uma lista de tuplas (nome da implementação, construção, {operação: função que recebe o grafo}).
+    '''
+    A = {'a' + str(k + 1): N[i] + '-' + N[j] for k, (i, j) in enumerate(pares)}
+    P = {'a' + str(k + 1): peso for k, peso in enumerate(pesos)}
+    origem = N[0]
+
+    def soma_graus(g):
+        return sum(g.grau(v) for v in N)
+
+    lista = []
+    if 'roteiro2' in modulos:
+        lista.append(('roteiro2', lambda: modulos['roteiro2'].Grafo(N, A), {
+            'dfs': lambda g: g.dfs(origem),
+            'grau': soma_graus,
+        }))
+    if 'roteiro3' in modulos:
+        lista.append(('roteiro3', lambda: modulos['roteiro3'].Grafo(N, A, P), {
+            'dfs': lambda g: g.dfs(origem),
+            'conexo': lambda g: g.conexo(),
+            'grau': soma_graus,
+            'ha_ciclo': lambda g: g.ha_ciclo(),
+            'dijkstra': lambda g: g.dijkstra(origem),
+        }))
+    for nome in ('roteiro5', 'roteiro5_numpy'):
+        if nome in modulos and len(N) <= LIMITE_MATRIZ:
+            classe = modulos[nome]
+
+            def constroi(classe=classe):
+                g = classe(list(N))
+                for aresta in A.values():
+                    g.adicionaAresta(aresta)
+                return g
+
+            lista.append((nome, constroi, {
+                'dfs': lambda g: g.dfs_tree(origem),
+                'eh_conexo': lambda g: g.eh_conexo(),
+                'grau': soma_graus,
+                'ha_pontes': lambda g: g.ha_pontes(),
+            }))
+    if 'roteiro7' in modulos and len(N) <= QTDE_CARACTERES and len(N) * len(pares) <= LIMITE_ROTEIRO7:
+        # O dijkstra do caderno só segue as arestas no sentido X-Y, então cada aresta entra nos dois sentidos
+        lista.append(('roteiro7', lambda: list(A.values()) + [a[2] + '-' + a[0] for a in A.values()], {
+            'dijkstra': lambda a: modulos['roteiro7'](N, a, origem, N[-1]),
+        }))
+    return lista
+
+
+def executa(familias, tamanhos, repeticoes, semente, modulos, instrumentar=False):
+    '''
+    Mede todas as operações em todas as famílias e tamanhos.
+    :param instrumentar: Se for True, cada operação é executada mais uma vez sob Instrumentacao, depois das medições e num grafo
+    construído só para isso, e as estatísticas por método entram no resultado. Essa execução extra não entra nos tempos.
+    '''
+    resultados = []
+    for familia in familias:
+        for tamanho in tamanhos:
+            gerador = random.Random(semente)
+            n, pares = GERADORES[familia](tamanho, gerador)
+            N = nomes_vertices(n)
+            pesos = [gerador.randint(1, 9) for _ in pares]
+            for implementacao, construcao, medidas in operacoes(modulos, N, pares, pesos):
+                medicoes = [('construcao', cronometra(construcao, repeticoes)[0], None)]
+                for operacao, funcao in medidas.items():
+                    tempos = cronometra(funcao, repeticoes, construcao)[0]
+                    estatisticas = None
+                    if instrumentar and implementacao != 'roteiro7':
+                        grafo = construcao()
+                        with Instrumentacao(grafo) as instrumentacao:
+                            funcao(grafo)
+                        estatisticas = instrumentacao.estatisticas
+                        # Libera o grafo instrumentado agora, para que a coleta de lixo não caia nas próximas medições
+                        del grafo, instrumentacao
+                        gc.collect()
+                    medicoes.append((operacao, tempos, estatisticas))
+                for operacao, tempos, estatisticas in medicoes:
+                    resultado = {
+                        'familia': familia,
+                        'tamanho': tamanho,
+                        'vertices': n,
+                        'arestas': len(pares),
+                        'implementacao': implementacao,
+                        'operacao': operacao,
+                        'tempos': tempos,
+                        'minimo': min(tempos),
+                        'mediana': statistics.median(tempos),
+                    }
+                    if estatisticas is not None:
+                        resultado['instrumentacao'] = estatisticas
+                    resultados.append(resultado)
+                    print('{:<16} {:>7} {:<15} {:<11} {:10.6f} s'.format(
+                        familia, tamanho, implementacao, operacao, statistics.median(tempos)), file=sys.stderr)
+    return resultados
+
+
+def versao_repositorio():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compara(resultados, anteriores, tolerancia):
+    '''
+    Compara as medianas com as de uma execução anterior.
+    :return: A lista de tuplas (chave, mediana anterior, mediana atual) das operações que ficaram mais lentas que a tolerância.
+    '''
+    def chave(r):
+        return r['familia'], r['tamanho'], r['implementacao'], r['operacao']
+
+    antes = {chave(r): r['mediana'] for r in anteriores}
+    regressoes = []
+    for r in resultados:
+        anterior = antes.get(chave(r))
+        if anterior and r['mediana'] > anterior * (1 + tolerancia):
+            regressoes.append((chave(r), anterior, r['mediana']))
+    return regressoes
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Benchmark das operações de Grafo em grafos sintéticos.')
+    parser.add_argument('--familias', nargs='+', choices=FAMILIAS, default=list(FAMILIAS))
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[100, 1000], help='Quantidade aproximada de vértices')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help='Arquivo JSON onde os resultados são gravados. Sem ele, vão para a saída padrão')
+    parser.add_argument('--comparar', help='Arquivo JSON de uma execução anterior')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Aumento relativo da mediana considerado regressão')
+    parser.add_argument('--sem-numpy', action='store_true', help='Não mede GrafoNumPy')
+    parser.add_argument('--instrumentar', action='store_true',
+                        help='Grava também chamadas, tempo e arestas examinadas por método em cada operação')
+    args = parser.parse_args(argumentos)
+
+    sys.path.insert(0, os.path.join(RAIZ, 'Roteiro5'))
+    modulos = {
+        'roteiro2': carrega_modulo('grafo2', os.path.join(RAIZ, 'Roteiro2', 'grafo2.py')),
+        'roteiro3': carrega_modulo('grafo3', os.path.join(RAIZ, 'Roteiro3', 'grafo3.py')),
+        'roteiro5': carrega_modulo('grafo_adj_nao_dir', os.path.join(RAIZ, 'Roteiro5', 'grafo_adj_nao_dir.py')).Grafo,
+        'roteiro7': carrega_dijkstra_roteiro7(),
+    }
+    if not args.sem_numpy:
+        try:
+            modulos['roteiro5_numpy'] = carrega_modulo(
+                'grafo_adj_nao_dir_numpy', os.path.join(RAIZ, 'Roteiro5', 'grafo_adj_nao_dir_numpy.py')).GrafoNumPy
+        except ImportError:
+            pass
+
+    resultados = executa(args.familias, args.tamanhos, args.repeticoes, args.semente, modulos, args.instrumentar)
+    relatorio = {
+        'versao': versao_repositorio(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'semente': args.semente,
+        'repeticoes': args.repeticoes,
+        'resultados': resultados,
+    }
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+    else:
+        json.dump(relatorio, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anteriores = json.load(arquivo)['resultados']
+        regressoes = compara(resultados, anteriores, args.tolerancia)
+        for (familia, tamanho, implementacao, operacao), antes, agora in regressoes:
+            print('Regressão: {} {} {} {}: {:.6f} s -> {:.6f} s'.format(
+                familia, tamanho, implementacao, operacao, antes, agora), file=sys.stderr)
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
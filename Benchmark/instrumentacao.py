@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+'''
+Instrumentação opcional dos métodos de um Grafo (Roteiro2, Roteiro3, Roteiro5 ou GrafoNumPy).
+
+Uso:
+    with Instrumentacao(g) as instrumentacao:
+        g.dfs('A')
+        g.ha_pontes()
+    print(instrumentacao)
+
+Dentro do bloco, cada método do grafo é substituído, só naquela instância, por um envoltório que conta as chamadas, o tempo e as
+arestas examinadas. Ao sair do bloco os envoltórios são removidos, então fora dele não há custo algum.
+'''
+import inspect
+import time
+
+
+class _VizinhosContados(list):
+    '''
+    Lista de vizinhos de um vértice que informa à instrumentação cada entrada lida, por iteração ou por índice.
+    append e remove, usados ao incluir e remover arestas, não contam.
+    '''
+
+    def __init__(self, vizinhos, instrumentacao):
+        super().__init__(vizinhos)
+        self.instrumentacao = instrumentacao
+
+    def __iter__(self):
+        for entrada in list.__iter__(self):
+            self.instrumentacao.conta_arestas(1)
+            yield entrada
+
+    def __getitem__(self, i):
+        entrada = super().__getitem__(i)
+        self.instrumentacao.conta_arestas(len(entrada) if isinstance(i, slice) else 1)
+        return entrada
+
+
+class _ListaContada(list):
+    '''
+    Lista de adjacência cujas listas de vizinhos são _VizinhosContados, inclusive as dos vértices incluídos durante a
+    instrumentação.
+    '''
+
+    def __init__(self, lista, instrumentacao):
+        super().__init__(_VizinhosContados(vizinhos, instrumentacao) for vizinhos in lista)
+        self.instrumentacao = instrumentacao
+
+    def append(self, vizinhos):
+        super().append(_VizinhosContados(vizinhos, self.instrumentacao))
+
+
+class Instrumentacao:
+    '''
+    Gerenciador de contexto que instrumenta um ou mais grafos.
+    Para cada método, estatisticas guarda a quantidade de chamadas, o tempo em segundos (incluindo os métodos chamados por ele, e
+    contando só uma vez as chamadas recursivas), as arestas examinadas durante as chamadas e os itens gerados, quando o método é
+    um gerador. Os métodos privados aparecem com o nome sem o prefixo da classe, como __dfs.
+    As arestas examinadas são as entradas lidas das listas de vizinhos da lista de adjacência (Roteiro2 e Roteiro3), sem contar
+    as inclusões e remoções de arestas, ou as geradas pelos métodos em FONTES_ARESTAS (Roteiro5).
+    '''
+
+    FONTES_ARESTAS = ('_Grafo__incidencias', '_Grafo__indices_adjacentes')
+    # Atributo que marca, enquanto durar o bloco, os grafos instrumentados
+    MARCA = '_instrumentacao'
+
+    def __init__(self, *grafos, callback=None):
+        '''
+        :param grafos: Os grafos a serem instrumentados. Um grafo passado mais de uma vez é instrumentado uma só vez.
+        :param callback: Opcional. Uma função chamada ao fim de cada operação de nível mais externo com os argumentos
+        (nome do método, duração em segundos, arestas examinadas). Para um gerador, a operação termina quando ele se esgota.
+        '''
+        self.grafos = list({id(grafo): grafo for grafo in grafos}.values())
+        self.callback = callback
+        self.estatisticas = {}
+        self.__ativos = {}
+        self.__profundidade = 0
+        self.__arestas = 0
+        self.__arestas_inicio = 0
+        self.__substituidos = []
+
+    def __enter__(self):
+        '''
+        :raises: RuntimeError se algum dos grafos já estiver sendo instrumentado, por exemplo num bloco with mais externo.
+        '''
+        # Verifica todos antes de alterar qualquer um, para não deixar grafos instrumentados pela metade
+        for grafo in self.grafos:
+            if Instrumentacao.MARCA in vars(grafo):
+                raise RuntimeError('O grafo já está sendo instrumentado')
+        for grafo in self.grafos:
+            self.__instrumenta(grafo)
+        return self
+
+    def __exit__(self, *excecao):
+        for grafo, nomes, adjacencia in self.__substituidos:
+            for nome in nomes:
+                delattr(grafo, nome)
+            delattr(grafo, Instrumentacao.MARCA)
+            if adjacencia is not None:
+                # list.copy devolve uma lista comum e não passa pelo __iter__ que conta as entradas
+                grafo._Grafo__adjacencia = [list.copy(vizinhos) for vizinhos in adjacencia]
+        self.__substituidos = []
+
+    def __instrumenta(self, grafo):
+        setattr(grafo, Instrumentacao.MARCA, self)
+        nomes = []
+        for classe in type(grafo).__mro__[:-1]:
+            for nome, valor in vars(classe).items():
+                if (nome.startswith('__') and nome.endswith('__')) or not inspect.isfunction(valor) or nome in nomes:
+                    continue
+                setattr(grafo, nome, self.__envolve(nome, getattr(grafo, nome)))
+                nomes.append(nome)
+
+        adjacencia = getattr(grafo, '_Grafo__adjacencia', None)
+        if type(adjacencia) is list:
+            grafo._Grafo__adjacencia = adjacencia = _ListaContada(adjacencia, self)
+        else:
+            adjacencia = None
+        self.__substituidos.append((grafo, nomes, adjacencia))
+
+    @staticmethod
+    def __legivel(nome):
+        '''
+        Remove o prefixo de classe que o Python acrescenta aos nomes privados: _Grafo__dfs vira __dfs.
+        '''
+        if nome.startswith('_') and '__' in nome[1:]:
+            return nome[nome.index('__', 1):]
+        return nome
+
+    def __envolve(self, nome, metodo):
+        fonte = nome in Instrumentacao.FONTES_ARESTAS
+        nome = Instrumentacao.__legivel(nome)
+
+        def envoltorio(*args, **kwargs):
+            self.__estatistica(nome)['chamadas'] += 1
+            self.__entra(nome)
+            inicio = time.perf_counter()
+            gerador = False
+            try:
+                resultado = metodo(*args, **kwargs)
+                gerador = inspect.isgenerator(resultado)
+            finally:
+                duracao = time.perf_counter() - inicio
+                self.__sai(nome, duracao, gerador)
+            if gerador:
+                return self.__envolve_gerador(nome, resultado, fonte, duracao)
+            return resultado
+
+        return envoltorio
+
+    def __envolve_gerador(self, nome, gerador, fonte, duracao):
+        '''
+        Repassa os itens de um gerador contando o tempo de cada retomada como tempo do método que o criou.
+        '''
+        try:
+            while True:
+                self.__entra(nome)
+                inicio = time.perf_counter()
+                continua = False
+                try:
+                    item = next(gerador)
+                    continua = True
+                    self.__estatistica(nome)['itens'] += 1
+                    if fonte:
+                        self.conta_arestas(1)
+                except StopIteration:
+                    return
+                finally:
+                    trecho = time.perf_counter() - inicio
+                    duracao += trecho
+                    self.__sai(nome, trecho, continua, duracao)
+                yield item
+        finally:
+            gerador.close()
+
+    def __estatistica(self, nome):
+        if nome not in self.estatisticas:
+            self.estatisticas[nome] = {'chamadas': 0, 'tempo': 0.0, 'arestas': 0, 'itens': 0}
+        return self.estatisticas[nome]
+
+    def __entra(self, nome):
+        if self.__profundidade == 0:
+            self.__arestas_inicio = self.__arestas
+        self.__profundidade += 1
+        self.__ativos[nome] = self.__ativos.get(nome, 0) + 1
+
+    def __sai(self, nome, duracao, continua=False, duracao_total=None):
+        '''
+        Encerra um trecho de execução de um método.
+        :param continua: Indica se o trecho é parte de um gerador que ainda não terminou, caso em que a operação não é encerrada.
+        :param duracao_total: A duração acumulada do gerador, informada ao callback quando ele termina.
+        '''
+        self.__profundidade -= 1
+        self.__ativos[nome] -= 1
+        if not self.__ativos[nome]:
+            del self.__ativos[nome]
+            self.__estatistica(nome)['tempo'] += duracao
+        if self.__profundidade == 0 and not continua and self.callback is not None:
+            self.callback(nome, duracao if duracao_total is None else duracao_total, self.__arestas - self.__arestas_inicio)
+
+    def conta_arestas(self, quantidade):
+        '''
+        Registra arestas examinadas, atribuindo-as a todos os métodos em execução.
+        '''
+        self.__arestas += quantidade
+        for nome in self.__ativos:
+            self.estatisticas[nome]['arestas'] += quantidade
+
+    def relatorio(self):
+        '''
+        :return: Uma lista de tuplas (método, chamadas, tempo, arestas, itens), do maior para o menor tempo.
+        '''
+        return sorted(((nome, e['chamadas'], e['tempo'], e['arestas'], e['itens']) for nome, e in self.estatisticas.items()),
+                      key=lambda linha: -linha[2])
+
+    def __str__(self):
+        linhas = ['{:<32} {:>10} {:>12} {:>12} {:>10}'.format('método', 'chamadas', 'tempo (s)', 'arestas', 'itens')]
+        for nome, chamadas, tempo, arestas, itens in self.relatorio():
+            linhas.append('{:<32} {:>10} {:>12.6f} {:>12} {:>10}'.format(nome, chamadas, tempo, arestas, itens))
+        return '\n'.join(linhas)
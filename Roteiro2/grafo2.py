@@ -1,3 +1,5 @@
+from collections import deque
+
 class VerticeInvalidoException(Exception):
     pass
 
@@ -20,13 +22,32 @@ class Grafo:
             if not(Grafo.verticeValido(v)):
                 raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
 
-        self.N = N
+        self.N = list(N)
+
+        # Índices mantidos em sincronia com N e A. Internamente cada vértice é representado pela sua posição em N, e os nomes só
+        # são usados na entrada e na saída dos métodos: vértice -> posição em N, lista de adjacência posição -> [(nome da aresta,
+        # posição do vizinho), ...], par normalizado (i, j) -> nomes das arestas e nome da aresta -> (i, j)
+        self.__indice_vertice = {}
+        self.__adjacencia = []
+        for i, v in enumerate(self.N):
+            self.__indice_vertice[v] = i
+            self.__adjacencia.append([])
+        self.__arestas_par = {}
+        self.__extremos = {}
+
+        # Contadores mantidos a cada aresta incluída ou removida: pares de vértices distintos adjacentes, laços e arestas
+        # paralelas (as arestas de um par além da primeira)
+        self.__qtde_pares = 0
+        self.__qtde_lacos = 0
+        self.__qtde_paralelas = 0
+
+        self.A = {}
 
         for a in A:
-            if not(self.arestaValida(A[a])):
+            vertices = self.__vertices_aresta(A[a])
+            if vertices is None:
                 raise ArestaInvalidaException('A aresta ' + A[a] + ' é inválida')
-
-        self.A = A
+            self.__registra_aresta(a, A[a], vertices)
 
     def arestaValida(self, aresta=''):
         '''
@@ -40,22 +61,80 @@ class Grafo:
         :return: Um valor booleano que indica se a aresta está no formato correto.
         '''
 
+        return self.__vertices_aresta(aresta) is not None
+
+    def __vertices_aresta(self, aresta):
+        '''
+        Separa uma aresta no formato a-b nos seus dois vértices, validando-a uma única vez.
+        :param aresta: A aresta a ser analisada.
+        :return: Uma tupla (i, j) com as posições em N dos vértices da aresta ou None se a aresta for inválida.
+        '''
+
         # Não pode haver mais de um caractere separador
         if aresta.count(Grafo.SEPARADOR_ARESTA) != Grafo.QTDE_MAX_SEPARADOR:
-            return False
+            return None
 
-        # Índice do elemento separador
-        i_traco = aresta.index(Grafo.SEPARADOR_ARESTA)
+        a, _, b = aresta.partition(Grafo.SEPARADOR_ARESTA)
 
         # O caractere separador não pode ser o primeiro ou o último caractere da aresta
-        if i_traco == 0 or aresta[-1] == Grafo.SEPARADOR_ARESTA:
-            return False
+        # e os vértices antes e depois do elemento separador devem existir no Grafo
+        i = self.__indice_vertice.get(a)
+        j = self.__indice_vertice.get(b)
+        if i is None or j is None:
+            return None
 
-        # Verifica se as arestas antes de depois do elemento separador existem no Grafo
-        if not(self.existeVertice(aresta[:i_traco])) or not(self.existeVertice(aresta[i_traco+1:])):
-            return False
+        return i, j
 
-        return True
+    @staticmethod
+    def __par(u, v):
+        '''
+        Normaliza um par de posições de vértices para que u-v e v-u sejam representados pela mesma chave.
+        :return: Uma tupla com as posições em ordem.
+        '''
+        return (u, v) if u <= v else (v, u)
+
+    def __registra_aresta(self, nome, aresta, vertices):
+        '''
+        Guarda a aresta em A e atualiza os índices auxiliares.
+        :param nome: O nome da aresta.
+        :param aresta: A aresta no formato a-b.
+        :param vertices: A tupla (i, j) já validada com as posições dos vértices da aresta.
+        '''
+        u, v = vertices
+        self.A[nome] = aresta
+        self.__extremos[nome] = vertices
+        nomes = self.__arestas_par.setdefault(Grafo.__par(u, v), [])
+        if nomes:
+            self.__qtde_paralelas += 1
+        elif u != v:
+            self.__qtde_pares += 1
+        if u == v:
+            self.__qtde_lacos += 1
+        nomes.append(nome)
+        self.__adjacencia[u].append((nome, v))
+        if u != v:
+            self.__adjacencia[v].append((nome, u))
+
+    def __desregistra_aresta(self, nome):
+        '''
+        Remove dos índices auxiliares a aresta com o nome passado. A entrada em A não é alterada.
+        :param nome: O nome da aresta.
+        '''
+        u, v = self.__extremos.pop(nome)
+        par = Grafo.__par(u, v)
+        nomes = self.__arestas_par[par]
+        nomes.remove(nome)
+        if nomes:
+            self.__qtde_paralelas -= 1
+        elif u != v:
+            self.__qtde_pares -= 1
+        if u == v:
+            self.__qtde_lacos -= 1
+        if not nomes:
+            del self.__arestas_par[par]
+        self.__adjacencia[u].remove((nome, v))
+        if u != v:
+            self.__adjacencia[v].remove((nome, u))
 
     @classmethod
     def verticeValido(self, vertice=''):
@@ -73,7 +152,7 @@ class Grafo:
         :param vertice: O vértice que deve ser verificado.
         :return: Um valor booleano que indica se o vértice existe no grafo.
         '''
-        return Grafo.verticeValido(vertice) and self.N.count(vertice) > 0
+        return vertice in self.__indice_vertice
 
     def existeAresta(self, aresta=''):
         '''
@@ -81,13 +160,15 @@ class Grafo:
         :param aresta: A aresta a ser verificada
         :return: Um valor booleano que indica se a aresta existe no grafo.
         '''
-        existe = False
-        if Grafo.arestaValida(self, aresta):
-            for k in self.A:
-                if aresta == self.A[k]:
-                    existe = True
+        vertices = self.__vertices_aresta(aresta)
+        if vertices is None:
+            return False
+
+        for nome in self.__arestas_par.get(Grafo.__par(*vertices), ()):
+            if self.__extremos[nome] == vertices:
+                return True
 
-        return existe
+        return False
 
     def adicionaVertice(self, v):
         '''
@@ -96,6 +177,8 @@ class Grafo:
         :raises: VerticeInvalidoException se o vértice passado como parâmetro não puder ser adicionado
         '''
         if self.verticeValido(v) and not self.existeVertice(v):
+            self.__indice_vertice[v] = len(self.N)
+            self.__adjacencia.append([])
             self.N.append(v)
         else:
             raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
@@ -106,106 +189,158 @@ class Grafo:
         :param v: A aresta a ser adicionada
         :raises: ArestaInvalidaException se a aresta passada como parâmetro não puder ser adicionada
         '''
-        if self.arestaValida(a):
-            self.A[nome] = a
-        else:
-            ArestaInvalidaException('A aresta ' + self.A[a] + ' é inválida')
+        vertices = self.__vertices_aresta(a)
+        if vertices is None:
+            raise ArestaInvalidaException('A aresta ' + a + ' é inválida')
+
+        if nome in self.A:
+            self.__desregistra_aresta(nome)
+        self.__registra_aresta(nome, a, vertices)
 
     def vertices_nao_adjacentes(self):
-        lista_de_valores = self.A.values()
         resultado = []
-        for i in self.N:
-            for j in self.N:
-                indo = '{}-{}'.format(i, j)
-                vindo = '{}-{}'.format(j, i)
-                if indo not in lista_de_valores and vindo not in lista_de_valores:
-                    resultado.append(indo)
+        for i in range(len(self.N)):
+            for j in range(len(self.N)):
+                if Grafo.__par(i, j) not in self.__arestas_par:
+                    resultado.append('{}-{}'.format(self.N[i], self.N[j]))
         return resultado
 
+    def pares_nao_adjacentes(self):
+        '''
+        Enumera sob demanda os pares de vértices distintos que não são adjacentes, ou seja, as arestas do grafo complementar.
+        Cada par aparece uma única vez, no formato X-Y com X sendo o vértice que aparece primeiro na lista de vértices.
+        :return: Um gerador com os pares não adjacentes.
+        '''
+        for i, j in self.__nao_adjacentes():
+            yield self.N[i] + Grafo.SEPARADOR_ARESTA + self.N[j]
+
+    def __nao_adjacentes(self):
+        '''
+        Gera os pares de posições (i, j), com i < j, de vértices não adjacentes. Para cada vértice, os vizinhos posteriores a ele são
+        ordenados e os pares são gerados nos intervalos entre eles, então o custo é O(V + E log E) mais o tamanho da saída.
+        '''
+        n = len(self.N)
+        for i in range(n):
+            anterior = i
+            for j in sorted({vizinho for _, vizinho in self.__adjacencia[i] if vizinho > i}) + [n]:
+                for k in range(anterior + 1, j):
+                    yield i, k
+                anterior = j
+
+    def complemento(self):
+        '''
+        Constrói o grafo complementar: um grafo simples com os mesmos vértices em que dois vértices distintos são adjacentes se, e
+        somente se, não são adjacentes neste grafo. As arestas recebem os nomes a1, a2, ...
+        :return: Um novo Grafo com o complemento.
+        '''
+        complemento = Grafo(self.N)
+        for i, j in self.__nao_adjacentes():
+            aresta = self.N[i] + Grafo.SEPARADOR_ARESTA + self.N[j]
+            complemento.__registra_aresta('a' + str(len(complemento.A) + 1), aresta, (i, j))
+        return complemento
+
     def ha_laco(self):
-        lista_de_valores = self.A.values()
-        for i in self.N:
-            for j in self.N:
-                aresta = '{}-{}'.format(i, j)
-                if(i==j) and aresta in lista_de_valores:
-                    return True
-        return False
+        return self.__qtde_lacos > 0
 
     def ha_paralelas(self):
-        count = 0
-        lista_de_valores = self.A.values()
-        for i in lista_de_valores:
-            for j in lista_de_valores:
-                i1, i2 = i.split('-')
-                j1, j2 = j.split('-')
-                if i1 == j1:
-                    if i2 == j2:
-                        count += 1
-                elif i1 == j2:
-                    if i2 == j1:
-                        count += 1
-            if count == 2:
-                return True
-            count = 0
-        return False
+        return self.__qtde_paralelas > 0
+
+    def eh_simples(self):
+        '''
+        Verifica em O(1) se o grafo é simples, ou seja, se não tem laços nem arestas paralelas.
+        '''
+        return self.__qtde_lacos == 0 and self.__qtde_paralelas == 0
+
+    def arestas_paralelas(self):
+        '''
+        Agrupa as arestas paralelas do grafo com uma única passada pelo índice de arestas por par de vértices, em O(E).
+        :return: Um dicionário que associa cada par de vértices ligado por mais de uma aresta, no formato X-Y com X sendo o vértice
+        que aparece primeiro na lista de vértices, à lista com os nomes dessas arestas. A multiplicidade do par é o tamanho da lista.
+        '''
+        paralelas = {}
+        for (i, j), nomes in self.__arestas_par.items():
+            if len(nomes) > 1:
+                paralelas[self.N[i] + Grafo.SEPARADOR_ARESTA + self.N[j]] = list(nomes)
+        return paralelas
+
+    def __vizinhanca(self, vertice):
+        '''
+        Fornece a lista de adjacência de um vértice dado pelo nome.
+        :return: A lista de tuplas (nome da aresta, posição do vizinho), ou uma tupla vazia se o vértice não existir.
+        '''
+        i = self.__indice_vertice.get(vertice)
+        return () if i is None else self.__adjacencia[i]
 
     def grau(self, vertice):
-        count = 0
-        lista_de_valores = self.A.values()
-        for i in lista_de_valores:
-            i1, i2 = i.split('-')
-            if(vertice == i1) or (vertice == i2):
-                count += 1
-        return count
+        return len(self.__vizinhanca(vertice))
 
     def arestas_sobre_vertice(self,vertice):
-        resultado = []
-        for i in self.A.keys():
-            aresta = self.A.get(i)
-            a1, a2 = aresta.split('-')
-            if a1 == vertice or a2 == vertice:
-                resultado.append(i)
-        return resultado
+        return [nome for nome, _ in self.__vizinhanca(vertice)]
 
     def eh_completo(self):
-        for i in self.N:
-            for j in self.N:
-                aresta = '{}-{}'.format(i, j)
-                aresta2 = '{}-{}'.format(j, i)
-                if self.existeAresta(aresta) or self.existeAresta(aresta2):
-                    pass
-                elif(i == j):
-                    pass
-                else:
-                    return False
-        return True
+        n = len(self.N)
+        return self.__qtde_pares == n * (n - 1) // 2
 
     def vertices_adjacentes(self, vertice):
-        resultado = []
-        arestas_sobre_vertice = self.arestas_sobre_vertice(vertice)
-        for i in range(0, len(arestas_sobre_vertice)):
-            resultado.append(self.A.get(arestas_sobre_vertice[i]))
-            i1, i2 = resultado[i].split('-')
-            if i1 == vertice:
-                resultado[i] = i2
-            elif i2 == vertice:
-                resultado[i] = i1
-        return resultado
+        return [self.N[vizinho] for _, vizinho in self.__vizinhanca(vertice)]
 
     def dfs(self,vertice):
-        retorno = [vertice]
-        return self.recursao(vertice,retorno)
+        return list(self.percurso_dfs(vertice))
 
     def recursao(self, vertice, retorno):
-        arestas_sobre_vertice = self.arestas_sobre_vertice(vertice)
-        vertices_adjacentes = self.vertices_adjacentes(vertice)
-        for i in range(0, len(vertices_adjacentes)):
-                if vertices_adjacentes[i] not in retorno:
-                    retorno.append(arestas_sobre_vertice[i])
-                    retorno.append(vertices_adjacentes[i])
-                    retorno = self.recursao(vertices_adjacentes[i], retorno)
+        visitados = {self.__indice_vertice[v] for v in retorno if v in self.__indice_vertice}
+        retorno.extend(self.__dfs(vertice, visitados))
         return retorno
 
+    def percurso_dfs(self, vertice):
+        '''
+        Percorre o grafo em profundidade a partir de um vértice usando uma pilha explícita, sem recursão.
+        :param vertice: O vértice onde o percurso começa.
+        :return: Um gerador com o vértice inicial seguido, para cada vértice descoberto, da aresta usada para alcançá-lo e do próprio vértice.
+        '''
+        yield vertice
+        yield from self.__dfs(vertice, {self.__indice_vertice.get(vertice)})
+
+    def __dfs(self, vertice, visitados):
+        '''
+        Gera as arestas e vértices descobertos pela busca em profundidade a partir de vertice.
+        :param vertice: O vértice onde a busca começa.
+        :param visitados: Conjunto das posições dos vértices já visitados. É atualizado durante a busca.
+        '''
+        pilha = [iter(self.__vizinhanca(vertice))]
+        while pilha:
+            for aresta, vizinho in pilha[-1]:
+                if vizinho not in visitados:
+                    visitados.add(vizinho)
+                    yield aresta
+                    yield self.N[vizinho]
+                    pilha.append(iter(self.__adjacencia[vizinho]))
+                    break
+            else:
+                pilha.pop()
+
+    def percurso_bfs(self, vertice):
+        '''
+        Percorre o grafo em largura a partir de um vértice.
+        :param vertice: O vértice onde o percurso começa.
+        :return: Um gerador com o vértice inicial seguido, para cada vértice descoberto, da aresta usada para alcançá-lo e do próprio vértice.
+        '''
+        yield vertice
+        if vertice not in self.__indice_vertice:
+            return
+        inicio = self.__indice_vertice[vertice]
+        visitados = bytearray(len(self.N))
+        visitados[inicio] = 1
+        fila = deque([inicio])
+        while fila:
+            atual = fila.popleft()
+            for aresta, vizinho in self.__adjacencia[atual]:
+                if not visitados[vizinho]:
+                    visitados[vizinho] = 1
+                    yield aresta
+                    yield self.N[vizinho]
+                    fila.append(vizinho)
+
     def __str__(self):
         '''
         Fornece uma representação do tipo String do grafo.
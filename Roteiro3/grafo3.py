@@ -1,3 +1,9 @@
+import heapq
+import math
+import random
+from collections import deque
+from itertools import islice
+
 class VerticeInvalidoException(Exception):
     pass
 
@@ -8,25 +14,140 @@ class Grafo:
 
     QTDE_MAX_SEPARADOR = 1
     SEPARADOR_ARESTA = '-'
+    PESO_PADRAO = 1
+    PROBABILIDADE_ERRO_CORES = 0.01
+    # Maior comprimento aceito pelo método 'cores' sem tentativas explícitas; acima disso a quantidade padrão de tentativas cresce
+    # mais de 2,5 vezes a cada aresta a mais (cerca de 4900 tentativas para n = 8 e 33000 para n = 10)
+    COMPRIMENTO_MAX_CORES = 8
 
-    def __init__(self, N=[], A={}):
+    def __init__(self, N=[], A={}, P={}):
         '''
         Constrói um objeto do tipo Grafo. Se nenhum parâmetro for passado, cria um Grafo vazio.
         Se houver alguma aresta ou algum vértice inválido, uma exceção é lançada.
         :param N: Uma lista dos vértices (ou nodos) do grafo.
         :param V: Uma dicionário que guarda as arestas do grafo. A chave representa o nome da aresta e o valor é uma string que contém dois vértices separados por um traço.
+        :param P: Um dicionário opcional com o peso de cada aresta, indexado pelo nome da aresta. Arestas sem peso recebem PESO_PADRAO.
         '''
         for v in N:
             if not(Grafo.verticeValido(v)):
                 raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
 
-        self.N = N
+        self.N = list(N)
+
+        # Índices mantidos em sincronia com N e A. Internamente cada vértice é representado pela sua posição em N, e os nomes só
+        # são usados na entrada e na saída dos métodos: vértice -> posição em N, lista de adjacência posição -> [(nome da aresta,
+        # posição do vizinho), ...], par normalizado (i, j) -> nomes das arestas e nome da aresta -> (i, j)
+        self.__indice_vertice = {}
+        self.__adjacencia = []
+        for i, v in enumerate(self.N):
+            self.__indice_vertice[v] = i
+            self.__adjacencia.append([])
+        self.__arestas_par = {}
+        self.__extremos = {}
+
+        # Contadores mantidos a cada aresta incluída ou removida: pares de vértices distintos adjacentes, laços e arestas
+        # paralelas (as arestas de um par além da primeira)
+        self.__qtde_pares = 0
+        self.__qtde_lacos = 0
+        self.__qtde_paralelas = 0
+
+        # Conjuntos disjuntos (union-find) com as componentes conexas. São montados na primeira consulta, atualizados a cada
+        # aresta incluída e descartados quando uma remoção pode ter separado uma componente
+        self.__pai = None
+        self.__tamanho = None
+        self.__qtde_componentes = 0
+
+        self.A = {}
+        self.P = {}
+
+        for a in P:
+            if a not in A:
+                raise ArestaInvalidaException('A aresta ' + a + ' não existe para receber um peso')
 
         for a in A:
-            if not(self.arestaValida(A[a])):
+            vertices = self.__vertices_aresta(A[a])
+            if vertices is None:
                 raise ArestaInvalidaException('A aresta ' + A[a] + ' é inválida')
+            peso = P.get(a, Grafo.PESO_PADRAO)
+            if not Grafo.pesoValido(peso):
+                raise ArestaInvalidaException('O peso da aresta ' + a + ' é inválido')
+            self.__registra_aresta(a, A[a], vertices, peso)
 
-        self.A = A
+    @classmethod
+    def carrega_arestas(cls, fonte, N=None, tamanho_lote=100000):
+        '''
+        Constrói um Grafo lendo as arestas de um arquivo ou de um iterável de linhas, em lotes, sem carregar a entrada inteira na memória.
+        Cada linha tem uma aresta no formato X-Y ou uma linha de CSV X,Y[,peso]. Linhas vazias ou começadas por # são ignoradas.
+        As arestas recebem os nomes a1, a2, ... na ordem em que são lidas.
+        :param fonte: O caminho de um arquivo ou um iterável de linhas (por exemplo, um arquivo aberto).
+        :param N: Opcional. A lista de vértices do grafo. Se não for passada, os vértices são criados à medida que aparecem nas arestas.
+        :param tamanho_lote: A quantidade máxima de linhas lidas de cada vez.
+        :return: O Grafo construído.
+        :raises: ArestaInvalidaException se alguma linha não representar uma aresta válida.
+        :raises: ValueError se tamanho_lote não for positivo.
+        '''
+        if tamanho_lote <= 0:
+            raise ValueError('O tamanho do lote deve ser positivo')
+        grafo = cls(N if N is not None else [])
+        qtde_arestas = 0
+        for lote in Grafo.__le_lotes(fonte, tamanho_lote):
+            for x, y, peso in lote:
+                aresta = x + Grafo.SEPARADOR_ARESTA + y
+                for v in (x, y):
+                    if not grafo.existeVertice(v):
+                        if N is not None:
+                            raise ArestaInvalidaException('A aresta ' + aresta + ' é inválida')
+                        grafo.adicionaVertice(v)
+                if peso is None:
+                    peso = Grafo.PESO_PADRAO
+                elif not Grafo.pesoValido(peso):
+                    raise ArestaInvalidaException('O peso da aresta ' + aresta + ' é inválido')
+                qtde_arestas += 1
+                vertices = (grafo.__indice_vertice[x], grafo.__indice_vertice[y])
+                grafo.__registra_aresta('a' + str(qtde_arestas), aresta, vertices, peso)
+        return grafo
+
+    @staticmethod
+    def __le_lotes(fonte, tamanho_lote):
+        '''
+        Lê as arestas de uma fonte em lotes de no máximo tamanho_lote linhas, validando o formato de cada linha uma única vez.
+        :param fonte: O caminho de um arquivo ou um iterável de linhas.
+        :param tamanho_lote: A quantidade máxima de linhas lidas de cada vez.
+        :return: Um gerador de listas de tuplas (X, Y, peso), onde peso é None se a linha não tiver peso.
+        '''
+        if isinstance(fonte, str):
+            with open(fonte, encoding='utf-8') as arquivo:
+                yield from Grafo.__le_lotes(arquivo, tamanho_lote)
+            return
+
+        linhas = iter(fonte)
+        while True:
+            bloco = list(islice(linhas, tamanho_lote))
+            if not bloco:
+                return
+            lote = []
+            for linha in bloco:
+                linha = linha.strip()
+                if not linha or linha.startswith('#'):
+                    continue
+                peso = None
+                if ',' in linha:
+                    campos = [campo.strip() for campo in linha.split(',')]
+                    x, y = campos[0], campos[1]
+                    if len(campos) > 2:
+                        try:
+                            peso = int(campos[2])
+                        except ValueError:
+                            try:
+                                peso = float(campos[2])
+                            except ValueError:
+                                raise ArestaInvalidaException('O peso da aresta ' + linha + ' é inválido')
+                else:
+                    x, _, y = linha.partition(Grafo.SEPARADOR_ARESTA)
+                if not Grafo.verticeValido(x) or not Grafo.verticeValido(y):
+                    raise ArestaInvalidaException('A aresta ' + linha + ' é inválida')
+                lote.append((x, y, peso))
+            yield lote
 
     def arestaValida(self, aresta=''):
         '''
@@ -40,22 +161,95 @@ class Grafo:
         :return: Um valor booleano que indica se a aresta está no formato correto.
         '''
 
+        return self.__vertices_aresta(aresta) is not None
+
+    def __vertices_aresta(self, aresta):
+        '''
+        Separa uma aresta no formato a-b nos seus dois vértices, validando-a uma única vez.
+        :param aresta: A aresta a ser analisada.
+        :return: Uma tupla (i, j) com as posições em N dos vértices da aresta ou None se a aresta for inválida.
+        '''
+
         # Não pode haver mais de um caractere separador
         if aresta.count(Grafo.SEPARADOR_ARESTA) != Grafo.QTDE_MAX_SEPARADOR:
-            return False
+            return None
 
-        # Índice do elemento separador
-        i_traco = aresta.index(Grafo.SEPARADOR_ARESTA)
+        a, _, b = aresta.partition(Grafo.SEPARADOR_ARESTA)
 
         # O caractere separador não pode ser o primeiro ou o último caractere da aresta
-        if i_traco == 0 or aresta[-1] == Grafo.SEPARADOR_ARESTA:
-            return False
+        # e os vértices antes e depois do elemento separador devem existir no Grafo
+        i = self.__indice_vertice.get(a)
+        j = self.__indice_vertice.get(b)
+        if i is None or j is None:
+            return None
 
-        # Verifica se as arestas antes de depois do elemento separador existem no Grafo
-        if not(self.existeVertice(aresta[:i_traco])) or not(self.existeVertice(aresta[i_traco+1:])):
-            return False
+        return i, j
 
-        return True
+    @staticmethod
+    def __par(u, v):
+        '''
+        Normaliza um par de posições de vértices para que u-v e v-u sejam representados pela mesma chave.
+        :return: Uma tupla com as posições em ordem.
+        '''
+        return (u, v) if u <= v else (v, u)
+
+    @staticmethod
+    def pesoValido(peso):
+        '''
+        Verifica se um peso de aresta é válido. O peso deve ser um número não negativo.
+        :param peso: O peso a ser analisado.
+        :return: Um valor booleano que indica se o peso é válido.
+        '''
+        return isinstance(peso, (int, float)) and not isinstance(peso, bool) and peso >= 0
+
+    def __registra_aresta(self, nome, aresta, vertices, peso):
+        '''
+        Guarda a aresta em A, o seu peso em P e atualiza os índices auxiliares.
+        :param nome: O nome da aresta.
+        :param aresta: A aresta no formato a-b.
+        :param vertices: A tupla (i, j) já validada com as posições dos vértices da aresta.
+        :param peso: O peso já validado da aresta.
+        '''
+        u, v = vertices
+        self.A[nome] = aresta
+        self.P[nome] = peso
+        self.__extremos[nome] = vertices
+        nomes = self.__arestas_par.setdefault(Grafo.__par(u, v), [])
+        if nomes:
+            self.__qtde_paralelas += 1
+        elif u != v:
+            self.__qtde_pares += 1
+        if u == v:
+            self.__qtde_lacos += 1
+        nomes.append(nome)
+        self.__adjacencia[u].append((nome, v))
+        if u != v:
+            self.__adjacencia[v].append((nome, u))
+        if self.__pai is not None:
+            self.__une(u, v)
+
+    def __desregistra_aresta(self, nome):
+        '''
+        Remove dos índices auxiliares a aresta com o nome passado. A entrada em A não é alterada.
+        :param nome: O nome da aresta.
+        '''
+        u, v = self.__extremos.pop(nome)
+        par = Grafo.__par(u, v)
+        nomes = self.__arestas_par[par]
+        nomes.remove(nome)
+        if nomes:
+            self.__qtde_paralelas -= 1
+        elif u != v:
+            self.__qtde_pares -= 1
+        if u == v:
+            self.__qtde_lacos -= 1
+        if not nomes:
+            del self.__arestas_par[par]
+            # Sem outra aresta entre u e v, a componente pode ter se separado
+            self.__pai = None
+        self.__adjacencia[u].remove((nome, v))
+        if u != v:
+            self.__adjacencia[v].remove((nome, u))
 
     @classmethod
     def verticeValido(self, vertice=''):
@@ -73,7 +267,7 @@ class Grafo:
         :param vertice: O vértice que deve ser verificado.
         :return: Um valor booleano que indica se o vértice existe no grafo.
         '''
-        return Grafo.verticeValido(vertice) and self.N.count(vertice) > 0
+        return vertice in self.__indice_vertice
 
     def existeAresta(self, aresta=''):
         '''
@@ -81,13 +275,15 @@ class Grafo:
         :param aresta: A aresta a ser verificada
         :return: Um valor booleano que indica se a aresta existe no grafo.
         '''
-        existe = False
-        if Grafo.arestaValida(self, aresta):
-            for k in self.A:
-                if aresta == self.A[k]:
-                    existe = True
+        vertices = self.__vertices_aresta(aresta)
+        if vertices is None:
+            return False
 
-        return existe
+        for nome in self.__arestas_par.get(Grafo.__par(*vertices), ()):
+            if self.__extremos[nome] == vertices:
+                return True
+
+        return False
 
     def adicionaVertice(self, v):
         '''
@@ -96,188 +292,633 @@ class Grafo:
         :raises: VerticeInvalidoException se o vértice passado como parâmetro não puder ser adicionado
         '''
         if self.verticeValido(v) and not self.existeVertice(v):
+            self.__indice_vertice[v] = len(self.N)
+            self.__adjacencia.append([])
+            if self.__pai is not None:
+                self.__pai.append(len(self.N))
+                self.__tamanho.append(1)
+                self.__qtde_componentes += 1
             self.N.append(v)
         else:
             raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
 
-    def adicionaAresta(self, nome, a):
+    def adicionaAresta(self, nome, a, peso=PESO_PADRAO):
         '''
         Adiciona uma aresta no Grafo caso a aresta seja válida e não exista outra aresta com o mesmo nome
         :param v: A aresta a ser adicionada
+        :param peso: O peso da aresta, um número não negativo
         :raises: ArestaInvalidaException se a aresta passada como parâmetro não puder ser adicionada
         '''
-        if self.arestaValida(a):
-            self.A[nome] = a
-        else:
-            ArestaInvalidaException('A aresta ' + self.A[a] + ' é inválida')
+        vertices = self.__vertices_aresta(a)
+        if vertices is None:
+            raise ArestaInvalidaException('A aresta ' + a + ' é inválida')
+
+        if not Grafo.pesoValido(peso):
+            raise ArestaInvalidaException('O peso da aresta ' + nome + ' é inválido')
+
+        if nome in self.A:
+            self.__desregistra_aresta(nome)
+        self.__registra_aresta(nome, a, vertices, peso)
+
+    def remove_aresta(self, nome):
+        '''
+        Remove do Grafo a aresta com o nome passado
+        :param nome: O nome da aresta a ser removida
+        :raises: ArestaInvalidaException se não existir aresta com esse nome
+        '''
+        if nome not in self.A:
+            raise ArestaInvalidaException('A aresta ' + nome + ' não existe')
+
+        self.__desregistra_aresta(nome)
+        del self.A[nome]
+        del self.P[nome]
 
     def vertices_nao_adjacentes(self):
-        lista_de_valores = self.A.values()
         resultado = []
-        for i in self.N:
-            for j in self.N:
-                indo = '{}-{}'.format(i, j)
-                vindo = '{}-{}'.format(j, i)
-                if indo not in lista_de_valores and vindo not in lista_de_valores:
-                    resultado.append(indo)
+        for i in range(len(self.N)):
+            for j in range(len(self.N)):
+                if Grafo.__par(i, j) not in self.__arestas_par:
+                    resultado.append('{}-{}'.format(self.N[i], self.N[j]))
         return resultado
 
+    def pares_nao_adjacentes(self):
+        '''
+        Enumera sob demanda os pares de vértices distintos que não são adjacentes, ou seja, as arestas do grafo complementar.
+        Cada par aparece uma única vez, no formato X-Y com X sendo o vértice que aparece primeiro na lista de vértices.
+        :return: Um gerador com os pares não adjacentes.
+        '''
+        for i, j in self.__nao_adjacentes():
+            yield self.N[i] + Grafo.SEPARADOR_ARESTA + self.N[j]
+
+    def __nao_adjacentes(self):
+        '''
+        Gera os pares de posições (i, j), com i < j, de vértices não adjacentes. Para cada vértice, os vizinhos posteriores a ele são
+        ordenados e os pares são gerados nos intervalos entre eles, então o custo é O(V + E log E) mais o tamanho da saída.
+        '''
+        n = len(self.N)
+        for i in range(n):
+            anterior = i
+            for j in sorted({vizinho for _, vizinho in self.__adjacencia[i] if vizinho > i}) + [n]:
+                for k in range(anterior + 1, j):
+                    yield i, k
+                anterior = j
+
+    def complemento(self):
+        '''
+        Constrói o grafo complementar: um grafo simples com os mesmos vértices em que dois vértices distintos são adjacentes se, e
+        somente se, não são adjacentes neste grafo. As arestas recebem os nomes a1, a2, ...
+        :return: Um novo Grafo com o complemento.
+        '''
+        complemento = Grafo(self.N)
+        for i, j in self.__nao_adjacentes():
+            aresta = self.N[i] + Grafo.SEPARADOR_ARESTA + self.N[j]
+            complemento.__registra_aresta('a' + str(len(complemento.A) + 1), aresta, (i, j), Grafo.PESO_PADRAO)
+        return complemento
+
     def ha_laco(self):
-        lista_de_valores = self.A.values()
-        for i in self.N:
-            for j in self.N:
-                aresta = '{}-{}'.format(i, j)
-                if(i==j) and aresta in lista_de_valores:
-                    return True
-        return False
+        return self.__qtde_lacos > 0
 
     def ha_paralelas(self):
-        count = 0
-        lista_de_valores = self.A.values()
-        for i in lista_de_valores:
-            for j in lista_de_valores:
-                i1, i2 = i.split('-')
-                j1, j2 = j.split('-')
-                if i1 == j1:
-                    if i2 == j2:
-                        count += 1
-                elif i1 == j2:
-                    if i2 == j1:
-                        count += 1
-            if count == 2:
-                return True
-            count = 0
-        return False
+        return self.__qtde_paralelas > 0
+
+    def eh_simples(self):
+        '''
+        Verifica em O(1) se o grafo é simples, ou seja, se não tem laços nem arestas paralelas.
+        '''
+        return self.__qtde_lacos == 0 and self.__qtde_paralelas == 0
+
+    def arestas_paralelas(self):
+        '''
+        Agrupa as arestas paralelas do grafo com uma única passada pelo índice de arestas por par de vértices, em O(E).
+        :return: Um dicionário que associa cada par de vértices ligado por mais de uma aresta, no formato X-Y com X sendo o vértice
+        que aparece primeiro na lista de vértices, à lista com os nomes dessas arestas. A multiplicidade do par é o tamanho da lista.
+        '''
+        paralelas = {}
+        for (i, j), nomes in self.__arestas_par.items():
+            if len(nomes) > 1:
+                paralelas[self.N[i] + Grafo.SEPARADOR_ARESTA + self.N[j]] = list(nomes)
+        return paralelas
+
+    def __vizinhanca(self, vertice):
+        '''
+        Fornece a lista de adjacência de um vértice dado pelo nome.
+        :return: A lista de tuplas (nome da aresta, posição do vizinho), ou uma tupla vazia se o vértice não existir.
+        '''
+        i = self.__indice_vertice.get(vertice)
+        return () if i is None else self.__adjacencia[i]
 
     def grau(self, vertice):
-        count = 0
-        lista_de_valores = self.A.values()
-        for i in lista_de_valores:
-            i1, i2 = i.split('-')
-            if(vertice == i1) or (vertice == i2):
-                count += 1
-        return count
+        return len(self.__vizinhanca(vertice))
 
     def arestas_sobre_vertice(self,vertice):
-        resultado = []
-        for i in self.A.keys():
-            aresta = self.A.get(i)
-            a1, a2 = aresta.split('-')
-            if a1 == vertice or a2 == vertice:
-                resultado.append(i)
-        return resultado
+        return [nome for nome, _ in self.__vizinhanca(vertice)]
 
     def eh_completo(self):
-        for i in self.N:
-            for j in self.N:
-                aresta = '{}-{}'.format(i, j)
-                aresta2 = '{}-{}'.format(j, i)
-                if self.existeAresta(aresta) or self.existeAresta(aresta2):
-                    pass
-                elif(i == j):
-                    pass
-                else:
-                    return False
-        return True
+        n = len(self.N)
+        return self.__qtde_pares == n * (n - 1) // 2
 
     def vertices_adjacentes(self, vertice):
-        resultado = []
-        arestas_sobre_vertice = self.arestas_sobre_vertice(vertice)
-        for i in range(0, len(arestas_sobre_vertice)):
-            resultado.append(self.A.get(arestas_sobre_vertice[i]))
-            i1, i2 = resultado[i].split('-')
-            if i1 == vertice:
-                resultado[i] = i2
-            elif i2 == vertice:
-                resultado[i] = i1
-        return resultado
+        return [self.N[vizinho] for _, vizinho in self.__vizinhanca(vertice)]
 
     def dfs(self,vertice):
-        retorno = [vertice]
-        return self.recursao(vertice,retorno)
+        return list(self.percurso_dfs(vertice))
 
     def recursao(self, vertice, retorno):
-        arestas_sobre_vertice = self.arestas_sobre_vertice(vertice)
-        vertices_adjacentes = self.vertices_adjacentes(vertice)
-        for i in range(0, len(vertices_adjacentes)):
-                if vertices_adjacentes[i] not in retorno:
-                    retorno.append(arestas_sobre_vertice[i])
-                    retorno.append(vertices_adjacentes[i])
-                    retorno = self.recursao(vertices_adjacentes[i], retorno)
+        visitados = {self.__indice_vertice[v] for v in retorno if v in self.__indice_vertice}
+        retorno.extend(self.__dfs(vertice, visitados))
         return retorno
 
-    def ha_ciclo(self):
-        vertice = self.N[0]
-        retorno = [vertice]
-        resultado = self.hc_recursao(vertice,retorno)
-        tem_ciclo = False
-        ciclo = []
-        inicio = -1
-        fim = 0
-        vertice_inicial = ''
-        for i in self.N:
-            contador = 0
-            for j in resultado:
-                if i == j:
-                    contador += 1
-            if contador >= 2:
-                vertice_inicial = i
-                tem_ciclo = True
-        if(tem_ciclo == False):
-            return False
-        else:
-            for i in range(len(resultado)):
-                if(resultado[i] == vertice_inicial) and inicio == -1:
-                    inicio = i
-                elif(resultado[i] == vertice_inicial) and inicio != -1:
-                    fim = i
+    def percurso_dfs(self, vertice):
+        '''
+        Percorre o grafo em profundidade a partir de um vértice usando uma pilha explícita, sem recursão.
+        :param vertice: O vértice onde o percurso começa.
+        :return: Um gerador com o vértice inicial seguido, para cada vértice descoberto, da aresta usada para alcançá-lo e do próprio vértice.
+        '''
+        yield vertice
+        yield from self.__dfs(vertice, {self.__indice_vertice.get(vertice)})
+
+    def __dfs(self, vertice, visitados):
+        '''
+        Gera as arestas e vértices descobertos pela busca em profundidade a partir de vertice.
+        :param vertice: O vértice onde a busca começa.
+        :param visitados: Conjunto das posições dos vértices já visitados. É atualizado durante a busca.
+        '''
+        pilha = [iter(self.__vizinhanca(vertice))]
+        while pilha:
+            for aresta, vizinho in pilha[-1]:
+                if vizinho not in visitados:
+                    visitados.add(vizinho)
+                    yield aresta
+                    yield self.N[vizinho]
+                    pilha.append(iter(self.__adjacencia[vizinho]))
                     break
-            for i in range(inicio, fim+1):
-                ciclo.append(resultado[i])
-            return ciclo
+            else:
+                pilha.pop()
 
+    def percurso_bfs(self, vertice):
+        '''
+        Percorre o grafo em largura a partir de um vértice.
+        :param vertice: O vértice onde o percurso começa.
+        :return: Um gerador com o vértice inicial seguido, para cada vértice descoberto, da aresta usada para alcançá-lo e do próprio vértice.
+        '''
+        yield vertice
+        if vertice not in self.__indice_vertice:
+            return
+        inicio = self.__indice_vertice[vertice]
+        visitados = bytearray(len(self.N))
+        visitados[inicio] = 1
+        fila = deque([inicio])
+        while fila:
+            atual = fila.popleft()
+            for aresta, vizinho in self.__adjacencia[atual]:
+                if not visitados[vizinho]:
+                    visitados[vizinho] = 1
+                    yield aresta
+                    yield self.N[vizinho]
+                    fila.append(vizinho)
 
+    def ha_ciclo(self):
+        '''
+        Procura um ciclo em todas as componentes do grafo com uma única busca em profundidade, em O(V + E).
+        Laços e arestas paralelas também formam ciclos.
+        :return: Um ciclo que começa e termina no mesmo vértice, intercalando vértices e arestas como em dfs, ou False se o grafo
+        não tiver ciclos.
+        '''
+        return next(self.__ciclos(), False)
+
+    def ciclos_fundamentais(self):
+        '''
+        Encontra uma base de ciclos do grafo: cada aresta que fica fora da floresta da busca em profundidade fecha exatamente um
+        ciclo com as arestas da floresta. Qualquer ciclo do grafo pode ser obtido combinando os ciclos da base.
+        :return: Uma lista com os E - V + C ciclos fundamentais (C é o número de componentes conexas), cada um no formato de ha_ciclo.
+        '''
+        return list(self.__ciclos())
+
+    def __ciclos(self):
+        '''
+        Percorre todas as componentes com uma busca em profundidade iterativa, guardando para cada vértice a profundidade, o pai e a
+        aresta que leva ao pai. Como o grafo não é direcionado, toda aresta fora da floresta liga um vértice a um ancestral; ela é
+        tratada a partir do vértice mais profundo, e o ciclo é a própria aresta mais o caminho na floresta até o ancestral.
+        :return: Um gerador com o ciclo fundamental de cada aresta fora da floresta.
+        '''
+        n = len(self.N)
+        profundidade = [-1] * n
+        pai = [-1] * n
+        aresta_pai = [None] * n
+        for raiz in range(n):
+            if profundidade[raiz] != -1:
+                continue
+            profundidade[raiz] = 0
+            pilha = [(raiz, iter(self.__adjacencia[raiz]))]
+            while pilha:
+                u, vizinhos = pilha[-1]
+                for aresta, w in vizinhos:
+                    if aresta == aresta_pai[u]:
+                        continue
+                    if profundidade[w] == -1:
+                        profundidade[w] = profundidade[u] + 1
+                        pai[w] = u
+                        aresta_pai[w] = aresta
+                        pilha.append((w, iter(self.__adjacencia[w])))
+                        break
+                    if profundidade[w] <= profundidade[u]:
+                        ciclo = [self.N[u]]
+                        v = u
+                        while v != w:
+                            ciclo.append(aresta_pai[v])
+                            v = pai[v]
+                            ciclo.append(self.N[v])
+                        ciclo.append(aresta)
+                        ciclo.append(self.N[u])
+                        yield ciclo
+                else:
+                    pilha.pop()
 
     def hc_recursao(self, vertice, retorno):
-        arestas_sobre_vertice = self.arestas_sobre_vertice(vertice)
-        vertices_adjacentes = self.vertices_adjacentes(vertice)
-        for i in range(0, len(vertices_adjacentes)):
-                if arestas_sobre_vertice[i] not in retorno:
-                    retorno.append(arestas_sobre_vertice[i])
-                    retorno.append(vertices_adjacentes[i])
-                    retorno = self.hc_recursao(vertices_adjacentes[i], retorno)
+        for aresta, vizinho in self.__vizinhanca(vertice):
+                if aresta not in retorno:
+                    retorno.append(aresta)
+                    retorno.append(self.N[vizinho])
+                    retorno = self.hc_recursao(self.N[vizinho], retorno)
         return retorno
 
-    def caminho(self, n):
-        retorno = [self.N[0]]
-        return self.c_recursao(self.N[0], retorno, n)
+    def caminho(self, n, metodo='busca', tentativas=None, semente=None):
+        '''
+        Encontra um caminho de comprimento n, ou seja, com n arestas e n + 1 vértices, sem vértices nem arestas repetidos.
+        Todos os vértices são considerados como início, exceto os de componentes com menos de n + 1 vértices e os isolados.
+        :param n: O comprimento do caminho.
+        :param metodo: 'busca' faz uma busca exata com retrocesso. 'cores' usa codificação por cores (color-coding): em cada tentativa
+        os vértices recebem cores aleatórias e uma programação dinâmica procura um caminho com n + 1 cores diferentes, em
+        O(2^n · E) por tentativa. É indicado para n pequeno em grafos grandes, mas pode não achar um caminho que existe, com
+        probabilidade de no máximo PROBABILIDADE_ERRO_CORES quando tentativas não é passado.
+        :param tentativas: Opcional. A quantidade de colorações tentadas pelo método 'cores'. Se não for passada, n não pode ser
+        maior que COMPRIMENTO_MAX_CORES.
+        :param semente: Opcional. A semente do gerador de números aleatórios do método 'cores'.
+        :return: O caminho intercalando vértices e arestas como em dfs ou False se não houver caminho de comprimento n.
+        :raises: ValueError se o método for inválido ou se o método for 'cores', tentativas não for passado e n for maior que
+        COMPRIMENTO_MAX_CORES.
+        '''
+        if metodo not in ('busca', 'cores'):
+            raise ValueError('O método deve ser busca ou cores')
+        if metodo == 'cores' and tentativas is None and n > Grafo.COMPRIMENTO_MAX_CORES:
+            raise ValueError('Sem tentativas explícitas, o método cores aceita caminhos de até {} arestas'.format(
+                Grafo.COMPRIMENTO_MAX_CORES))
+        if n < 0:
+            return False
+
+        vizinhos = self.__vizinhos_simples()
+        componentes = self.componentes_conexas()
+        tamanhos = {}
+        for c in componentes.values():
+            tamanhos[c] = tamanhos.get(c, 0) + 1
+        inicios = [i for i, v in enumerate(self.N) if tamanhos[componentes[v]] > n and (n == 0 or vizinhos[i])]
+        if not inicios:
+            return False
+
+        if metodo == 'busca':
+            resultado = self.__caminho_busca(n, inicios, vizinhos)
+        else:
+            resultado = self.__caminho_cores(n, inicios, vizinhos, tentativas, random.Random(semente))
+        if resultado is None:
+            return False
+
+        vertices, arestas = resultado
+        caminho = [self.N[vertices[0]]]
+        for aresta, v in zip(arestas, vertices[1:]):
+            caminho.append(aresta)
+            caminho.append(self.N[v])
+        return caminho
+
+    def __vizinhos_simples(self):
+        '''
+        Monta, para cada posição de vértice, a lista de tuplas (nome da aresta, posição do vizinho) sem laços e com uma única aresta
+        para cada vizinho, que é o que importa para caminhos sem vértices repetidos.
+        '''
+        vizinhos = []
+        for i, adjacentes in enumerate(self.__adjacencia):
+            vistos = {i}
+            lista = []
+            for aresta, w in adjacentes:
+                if w not in vistos:
+                    vistos.add(w)
+                    lista.append((aresta, w))
+            vizinhos.append(lista)
+        return vizinhos
+
+    def __caminho_busca(self, n, inicios, vizinhos):
+        '''
+        Busca com retrocesso e pilha explícita um caminho com n arestas a partir de cada início.
+        Um vértice só entra no meio do caminho se tiver outro vizinho por onde continuar. Como o grafo não é direcionado, um início
+        sem caminho de comprimento n também não pode ser o fim de um, então ele é descartado como último vértice das buscas seguintes.
+        :return: Uma tupla (vértices, arestas) com as posições dos vértices e os nomes das arestas do caminho, ou None.
+        '''
+        visitados = bytearray(len(self.N))
+        sem_caminho = bytearray(len(self.N))
+        for inicio in inicios:
+            vertices = [inicio]
+            arestas = []
+            visitados[inicio] = 1
+            pilha = [iter(vizinhos[inicio])]
+            while pilha:
+                if len(arestas) == n:
+                    return vertices, arestas
+                ultimo = len(arestas) + 1 == n
+                for aresta, w in pilha[-1]:
+                    if visitados[w] or (ultimo and sem_caminho[w]) or (not ultimo and len(vizinhos[w]) < 2):
+                        continue
+                    visitados[w] = 1
+                    vertices.append(w)
+                    arestas.append(aresta)
+                    pilha.append(iter(vizinhos[w]))
+                    break
+                else:
+                    pilha.pop()
+                    visitados[vertices.pop()] = 0
+                    if arestas:
+                        arestas.pop()
+            sem_caminho[inicio] = 1
+        return None
+
+    def __caminho_cores(self, n, inicios, vizinhos, tentativas, gerador):
+        '''
+        Procura um caminho com n arestas por codificação por cores. Um caminho cujos k = n + 1 vértices têm cores diferentes é
+        necessariamente simples, e uma coloração aleatória com k cores deixa um caminho fixo com cores diferentes com
+        probabilidade q = k! / k^k, por isso são feitas ln(PROBABILIDADE_ERRO_CORES) / ln(1 - q) tentativas, o mínimo para que a
+        chance de nenhuma delas servir fique abaixo de PROBABILIDADE_ERRO_CORES.
+        Em cada tentativa, camadas[k][v] associa cada conjunto de cores (uma máscara de bits) de um caminho com k arestas terminado
+        em v à tupla (vértice anterior, aresta, conjunto anterior) usada para reconstruí-lo.
+        :return: Uma tupla (vértices, arestas) como em __caminho_busca, ou None.
+        '''
+        if tentativas is None:
+            q = math.factorial(n + 1) / (n + 1) ** (n + 1)
+            tentativas = math.ceil(math.log(Grafo.PROBABILIDADE_ERRO_CORES) / math.log1p(-q)) if q < 1 else 1
+
+        for _ in range(tentativas):
+            cores = [gerador.randrange(n + 1) for _ in self.N]
+            camadas = [{v: {1 << cores[v]: None} for v in inicios}]
+            for _ in range(n):
+                proxima = {}
+                for u, conjuntos in camadas[-1].items():
+                    for aresta, w in vizinhos[u]:
+                        cor = 1 << cores[w]
+                        for conjunto in conjuntos:
+                            if not conjunto & cor:
+                                proxima.setdefault(w, {}).setdefault(conjunto | cor, (u, aresta, conjunto))
+                if not proxima:
+                    break
+                camadas.append(proxima)
+            else:
+                v, conjuntos = next(iter(camadas[-1].items()))
+                conjunto = next(iter(conjuntos))
+                vertices = [v]
+                arestas = []
+                for camada in reversed(camadas[1:]):
+                    v, aresta, conjunto = camada[v][conjunto]
+                    vertices.append(v)
+                    arestas.append(aresta)
+                vertices.reverse()
+                arestas.reverse()
+                return vertices, arestas
+        return None
 
     def c_recursao(self, vertice, retorno, n):
-        arestas_sobre_vertice = self.arestas_sobre_vertice(vertice)
-        vertices_adjacentes = self.vertices_adjacentes(vertice)
-        for i in range(0, len(vertices_adjacentes)):
-                if vertices_adjacentes[i] not in retorno:
-                    retorno.append(arestas_sobre_vertice[i])
-                    retorno.append(vertices_adjacentes[i])
+        for aresta, vizinho in self.__vizinhanca(vertice):
+                if self.N[vizinho] not in retorno:
+                    retorno.append(aresta)
+                    retorno.append(self.N[vizinho])
                     if len(retorno) - abs(len(retorno)/2) >= n-1:
                         return retorno
-                    retorno = self.c_recursao(vertices_adjacentes[i], retorno, n)
+                    retorno = self.c_recursao(self.N[vizinho], retorno, n)
         return retorno
 
     def conexo(self):
-        for i in self.N:
-            for j in self.N:
-                if self.caminho_dois_vertices(i, j) == True:
-                    pass
-                else:
-                    return False
-        return True
-
+        self.__conjuntos()
+        return self.__qtde_componentes <= 1
 
     def caminho_dois_vertices(self, x, y):
-        lista = self.dfs(x)
-        if x in lista and y in lista:
-            return True
+        if not self.existeVertice(x) or not self.existeVertice(y):
+            return False
+        self.__conjuntos()
+        return self.__raiz(self.__indice_vertice[x]) == self.__raiz(self.__indice_vertice[y])
+
+    def componentes_conexas(self):
+        '''
+        Identifica as componentes conexas do grafo a partir dos conjuntos disjuntos mantidos pelo grafo.
+        :return: Um dicionário que associa cada vértice ao número (a partir de 0) da componente conexa a que ele pertence.
+        As componentes são numeradas na ordem em que aparecem na lista de vértices.
+        '''
+        self.__conjuntos()
+        rotulos = {}
+        componentes = {}
+        for i, v in enumerate(self.N):
+            raiz = self.__raiz(i)
+            if raiz not in rotulos:
+                rotulos[raiz] = len(rotulos)
+            componentes[v] = rotulos[raiz]
+        return componentes
+
+    def __conjuntos(self):
+        '''
+        Monta, se ainda não estiverem montados, os conjuntos disjuntos das componentes conexas unindo os extremos de cada par de vértices adjacentes.
+        '''
+        if self.__pai is None:
+            self.__pai = list(range(len(self.N)))
+            self.__tamanho = [1] * len(self.N)
+            self.__qtde_componentes = len(self.N)
+            for u, v in self.__arestas_par:
+                self.__une(u, v)
+
+    def __raiz(self, v):
+        '''
+        Encontra o representante do conjunto da posição v, encurtando pela metade o caminho percorrido até ele.
+        '''
+        pai = self.__pai
+        while pai[v] != v:
+            pai[v] = pai[pai[v]]
+            v = pai[v]
+        return v
+
+    def __une(self, u, v):
+        '''
+        Une os conjuntos de u e de v, pendurando o menor conjunto no maior.
+        '''
+        raiz_u = self.__raiz(u)
+        raiz_v = self.__raiz(v)
+        if raiz_u == raiz_v:
+            return
+        if self.__tamanho[raiz_u] < self.__tamanho[raiz_v]:
+            raiz_u, raiz_v = raiz_v, raiz_u
+        self.__pai[raiz_v] = raiz_u
+        self.__tamanho[raiz_u] += self.__tamanho[raiz_v]
+        self.__qtde_componentes -= 1
+
+    def dijkstra(self, origem, destino=None):
+        '''
+        Calcula os menores caminhos a partir de um vértice com o algoritmo de Dijkstra usando um heap binário, em O((V + E) log V).
+        Em vez de diminuir a prioridade de um vértice no heap, uma nova entrada é inserida e as entradas antigas são descartadas quando retiradas.
+        :param origem: O vértice de onde partem os caminhos.
+        :param destino: Opcional. Se for passado, a busca termina assim que a menor distância até ele é conhecida.
+        :return: Uma tupla (distancias, predecessores). distancias associa cada vértice cuja menor distância foi encontrada a essa distância e
+        predecessores associa cada um desses vértices, exceto a origem, à tupla (aresta, vértice anterior) do menor caminho.
+        :raises: VerticeInvalidoException se a origem não pertencer ao grafo.
+        '''
+        if not self.existeVertice(origem):
+            raise VerticeInvalidoException('O vértice ' + origem + ' é inválido')
+
+        n = len(self.N)
+        alvo = self.__indice_vertice.get(destino)
+        inicio = self.__indice_vertice[origem]
+        infinito = float('inf')
+        finalizados = bytearray(n)
+        melhores = [infinito] * n
+        anteriores = [None] * n
+        melhores[inicio] = 0
+        distancias = {}
+        heap = [(0, inicio)]
+        while heap:
+            distancia, u = heapq.heappop(heap)
+            if finalizados[u]:
+                continue
+            finalizados[u] = 1
+            distancias[self.N[u]] = distancia
+            if u == alvo:
+                break
+            for aresta, vizinho in self.__adjacencia[u]:
+                nova = distancia + self.P[aresta]
+                if not finalizados[vizinho] and nova < melhores[vizinho]:
+                    melhores[vizinho] = nova
+                    anteriores[vizinho] = (aresta, u)
+                    heapq.heappush(heap, (nova, vizinho))
+
+        predecessores = {}
+        for v in range(n):
+            if finalizados[v] and anteriores[v] is not None:
+                aresta, u = anteriores[v]
+                predecessores[self.N[v]] = (aresta, self.N[u])
+
+        return distancias, predecessores
+
+    def menor_caminho(self, origem, destino):
+        '''
+        Encontra o menor caminho entre dois vértices levando em conta o peso das arestas.
+        :param origem: O vértice de onde o caminho parte.
+        :param destino: O vértice onde o caminho termina.
+        :return: Uma tupla (distância, caminho), onde o caminho intercala vértices e arestas como em dfs, ou False se não houver caminho.
+        '''
+        distancias, predecessores = self.dijkstra(origem, destino)
+        if destino not in distancias:
+            return False
+
+        caminho = [destino]
+        v = destino
+        while v != origem:
+            aresta, v = predecessores[v]
+            caminho.append(aresta)
+            caminho.append(v)
+        caminho.reverse()
+
+        return distancias[destino], caminho
+
+    def rota_com_recarga(self, origem, destino, carga_maxima, recargas, carga_inicial=None):
+        '''
+        Encontra a rota de menor custo entre dois vértices para um veículo com bateria limitada, como um drone.
+        Percorrer uma aresta consome uma carga igual ao seu peso, e ao chegar num ponto de recarga a carga volta a ser carga_maxima.
+        A busca é um Dijkstra sobre os estados (vértice, carga restante), em O((V·C + E·C) log(V·C)), onde C é o número de cargas possíveis.
+        :param origem: O vértice de onde o veículo parte.
+        :param destino: O vértice onde a rota termina.
+        :param carga_maxima: A carga da bateria cheia.
+        :param recargas: Os vértices onde a bateria pode ser recarregada.
+        :param carga_inicial: Opcional. A carga do veículo na origem. Por padrão a bateria começa cheia.
+        :return: Uma tupla (custo, caminho), onde o caminho intercala vértices e arestas como em dfs, ou False se o destino não for alcançável.
+        '''
+        return self.rotas_com_recarga([(origem, destino)], carga_maxima, recargas, carga_inicial)[0]
+
+    def rotas_com_recarga(self, consultas, carga_maxima, recargas, carga_inicial=None):
+        '''
+        Responde várias consultas de rota_com_recarga de uma vez. Consultas com a mesma origem compartilham uma única busca.
+        :param consultas: Uma lista de tuplas (origem, destino).
+        :param carga_maxima: A carga da bateria cheia.
+        :param recargas: Os vértices onde a bateria pode ser recarregada.
+        :param carga_inicial: Opcional. A carga do veículo em cada origem. Por padrão a bateria começa cheia.
+        :return: Uma lista com a resposta de cada consulta, na mesma ordem, no formato retornado por rota_com_recarga.
+        '''
+        if not Grafo.pesoValido(carga_maxima):
+            raise ValueError('A carga máxima deve ser um número não negativo')
+        if carga_inicial is None:
+            carga_inicial = carga_maxima
+
+        recargas = set(recargas)
+        for v in recargas:
+            if not self.existeVertice(v):
+                raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
+
+        destinos_por_origem = {}
+        for origem, destino in consultas:
+            if not self.existeVertice(origem):
+                raise VerticeInvalidoException('O vértice ' + origem + ' é inválido')
+            destinos_por_origem.setdefault(origem, set()).add(destino)
+
+        recargas = {self.__indice_vertice[v] for v in recargas}
+        respostas = {}
+        for origem, destinos in destinos_por_origem.items():
+            rotas = self.__busca_com_recarga(origem, destinos, carga_maxima, recargas, carga_inicial)
+            for destino in destinos:
+                respostas[(origem, destino)] = rotas.get(destino, False)
+
+        return [respostas[consulta] for consulta in consultas]
+
+    def __busca_com_recarga(self, origem, destinos, carga_maxima, recargas, carga_inicial):
+        '''
+        Executa o Dijkstra sobre os estados (vértice, carga restante) a partir da origem até que todos os destinos sejam alcançados.
+        Como os estados são retirados do heap em ordem de custo, um estado é descartado se o seu vértice já foi alcançado com carga
+        maior ou igual, pois ele não pode levar a uma rota melhor.
+        :param recargas: O conjunto das posições em N dos pontos de recarga.
+        :return: Um dicionário destino -> (custo, caminho) com os destinos alcançáveis.
+        '''
+        origem = self.__indice_vertice[origem]
+        if origem in recargas:
+            carga_inicial = carga_maxima
+
+        inicio = (origem, carga_inicial)
+        predecessores = {}
+        melhores = {inicio: 0}
+        maior_carga = [-1] * len(self.N)
+        rotas = {}
+        pendentes = {self.__indice_vertice[d] for d in destinos if d in self.__indice_vertice}
+        heap = [(0, origem, carga_inicial)]
+
+        while heap and pendentes:
+            custo, u, carga = heapq.heappop(heap)
+            if carga <= maior_carga[u]:
+                continue
+            maior_carga[u] = carga
+
+            if u in pendentes:
+                pendentes.discard(u)
+                caminho = [self.N[u]]
+                estado = (u, carga)
+                while estado != inicio:
+                    aresta, estado = predecessores[estado]
+                    caminho.append(aresta)
+                    caminho.append(self.N[estado[0]])
+                caminho.reverse()
+                rotas[self.N[u]] = (custo, caminho)
+
+            for aresta, vizinho in self.__adjacencia[u]:
+                peso = self.P[aresta]
+                if peso > carga:
+                    continue
+                nova_carga = carga_maxima if vizinho in recargas else carga - peso
+                if nova_carga <= maior_carga[vizinho]:
+                    continue
+                estado = (vizinho, nova_carga)
+                novo_custo = custo + peso
+                if novo_custo < melhores.get(estado, float('inf')):
+                    melhores[estado] = novo_custo
+                    predecessores[estado] = (aresta, (u, carga))
+                    heapq.heappush(heap, (novo_custo, vizinho, nova_carga))
+
+        return rotas
 
     def __str__(self):
         '''
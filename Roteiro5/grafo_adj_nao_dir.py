@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+from collections import deque
+from itertools import compress, islice
+
 
 class VerticeInvalidoException(Exception):
     pass
@@ -15,6 +18,8 @@ class MatrizInvalidaException(Exception):
 class Grafo:
     QTDE_MAX_SEPARADOR = 1
     SEPARADOR_ARESTA = '-'
+    # Fração de pares de vértices adjacentes abaixo da qual distancias() usa buscas em largura em vez de Floyd-Warshall
+    DENSIDADE_BFS = 0.01
     __maior_vertice = 0
 
     def __init__(self, V=None, M=None):
@@ -54,21 +59,100 @@ class Grafo:
             if len(c) != len(V):
                 raise MatrizInvalidaException('A matriz passada como parâmetro não tem o tamanho correto')
 
+        # Como todos os vértices já foram validados, qualquer par deles forma uma aresta válida e basta verificar o formato da matriz
         for i in range(len(V)):
-            for j in range(len(V)):
+            for j in range(i):
                 '''
-                Verifica se os índices passados como parâmetro representam um elemento da matriz abaixo da diagonal principal.
-                Além disso, verifica se o referido elemento é um traço "-". Isso indica que a matriz é não direcionada e foi construída corretamente.
+                Verifica se o elemento abaixo da diagonal principal é um traço "-".
+                Isso indica que a matriz é não direcionada e foi construída corretamente.
                 '''
-                if i > j and not (M[i][j] == '-'):
+                if not (M[i][j] == '-'):
                     raise MatrizInvalidaException('A matriz não representa uma matriz não direcionada')
 
-                aresta = V[i] + Grafo.SEPARADOR_ARESTA + V[j]
-                if not (self.arestaValida(aresta)):
-                    raise ArestaInvalidaException('A aresta ' + aresta + ' é inválida')
-
         self.M = list(M)
 
+        # Grau de cada vértice, calculado na primeira consulta e depois mantido por adicionaAresta e remove_aresta
+        self.__graus = None
+
+        # Contadores [pares de vértices distintos adjacentes, laços, arestas paralelas, arestas], também calculados na primeira
+        # consulta e depois mantidos por adicionaAresta e remove_aresta
+        self.__contadores = None
+
+        # Índice de cada vértice na lista de vértices, completado à medida que vértices são incluídos
+        self.__indices = {}
+
+        # Conjuntos disjuntos (union-find) com as componentes conexas. São montados na primeira consulta, atualizados a cada
+        # aresta incluída e descartados quando uma remoção pode ter separado uma componente
+        self.__pai = None
+        self.__tamanho = None
+        self.__qtde_componentes = 0
+
+    @classmethod
+    def carrega_arestas(cls, fonte, V=None, tamanho_lote=100000):
+        '''
+        Constrói um Grafo lendo as arestas de um arquivo ou de um iterável de linhas, em lotes, sem carregar a entrada inteira na memória.
+        Cada linha tem uma aresta no formato X-Y ou uma linha de CSV X,Y (colunas a mais são ignoradas). Linhas vazias ou começadas
+        por # são ignoradas.
+        :param fonte: O caminho de um arquivo ou um iterável de linhas (por exemplo, um arquivo aberto).
+        :param V: Opcional. A lista de vértices do grafo. Se não for passada, os vértices são criados à medida que aparecem nas
+        arestas, de uma só vez para cada lote.
+        :param tamanho_lote: A quantidade máxima de linhas lidas de cada vez.
+        :return: O Grafo construído.
+        :raises: ArestaInvalidaException se alguma linha não representar uma aresta válida.
+        :raises: ValueError se tamanho_lote não for positivo.
+        '''
+        if tamanho_lote <= 0:
+            raise ValueError('O tamanho do lote deve ser positivo')
+        grafo = cls(list(V) if V is not None else [])
+        for lote in Grafo.__le_lotes(fonte, tamanho_lote):
+            novos = []
+            vistos = set()
+            for x, y in lote:
+                for v in (x, y):
+                    if not grafo.existeVertice(v) and v not in vistos:
+                        if V is not None:
+                            raise ArestaInvalidaException('A aresta ' + x + Grafo.SEPARADOR_ARESTA + y + ' é inválida')
+                        vistos.add(v)
+                        novos.append(v)
+            if novos:
+                grafo.adicionaVertices(novos)
+            for x, y in lote:
+                grafo.adicionaAresta(x + Grafo.SEPARADOR_ARESTA + y)
+        return grafo
+
+    @staticmethod
+    def __le_lotes(fonte, tamanho_lote):
+        '''
+        Lê as arestas de uma fonte em lotes de no máximo tamanho_lote linhas, validando o formato de cada linha uma única vez.
+        :param fonte: O caminho de um arquivo ou um iterável de linhas.
+        :param tamanho_lote: A quantidade máxima de linhas lidas de cada vez.
+        :return: Um gerador de listas de tuplas (X, Y).
+        '''
+        if isinstance(fonte, str):
+            with open(fonte, encoding='utf-8') as arquivo:
+                yield from Grafo.__le_lotes(arquivo, tamanho_lote)
+            return
+
+        linhas = iter(fonte)
+        while True:
+            bloco = list(islice(linhas, tamanho_lote))
+            if not bloco:
+                return
+            lote = []
+            for linha in bloco:
+                linha = linha.strip()
+                if not linha or linha.startswith('#'):
+                    continue
+                if ',' in linha:
+                    campos = [campo.strip() for campo in linha.split(',')]
+                    x, y = campos[0], campos[1]
+                else:
+                    x, _, y = linha.partition(Grafo.SEPARADOR_ARESTA)
+                if not Grafo.verticeValido(x) or not Grafo.verticeValido(y):
+                    raise ArestaInvalidaException('A aresta ' + linha + ' é inválida')
+                lote.append((x, y))
+            yield lote
+
     def arestaValida(self, aresta=''):
         '''
         Verifica se uma aresta passada como parâmetro está dentro do padrão estabelecido.
@@ -81,21 +165,46 @@ class Grafo:
         :return: Um valor booleano que indica se a aresta está no formato correto.
         '''
 
+        return self._indices_aresta(aresta) is not None
+
+    def _indices_aresta(self, aresta):
+        '''
+        Separa uma aresta no formato X-Y nos índices dos seus dois vértices, validando-a uma única vez.
+        :param aresta: A aresta a ser analisada.
+        :return: Uma tupla (i, j) com os índices de X e de Y na lista de vértices ou None se a aresta for inválida.
+        '''
+
         # Não pode haver mais de um caractere separador
         if aresta.count(Grafo.SEPARADOR_ARESTA) != Grafo.QTDE_MAX_SEPARADOR:
-            return False
-
-        # Índice do elemento separador
-        i_traco = aresta.index(Grafo.SEPARADOR_ARESTA)
+            return None
 
         # O caractere separador não pode ser o primeiro ou o último caractere da aresta
-        if i_traco == 0 or aresta[-1] == Grafo.SEPARADOR_ARESTA:
-            return False
+        # e os vértices antes e depois do elemento separador devem existir no Grafo
+        x, _, y = aresta.partition(Grafo.SEPARADOR_ARESTA)
+        i = self.indice_vertice(x)
+        j = self.indice_vertice(y)
+        if i is None or j is None:
+            return None
 
-        if not (self.existeVertice(aresta[:i_traco])) or not (self.existeVertice(aresta[i_traco + 1:])):
-            return False
+        return i, j
+
+    def __aresta(self, i, j):
+        '''
+        Formata a aresta entre os vértices de índices i e j no formato X-Y, com X sendo o vértice que aparece primeiro na lista de vértices.
+        '''
+        if i > j:
+            i, j = j, i
+        return self.N[i] + Grafo.SEPARADOR_ARESTA + self.N[j]
 
-        return True
+    def __indice_existente(self, v):
+        '''
+        Dado um vértice, retorna o seu índice na lista de vértices.
+        :raises: VerticeInvalidoException se o vértice não pertencer ao grafo.
+        '''
+        i = self.indice_vertice(v)
+        if i is None:
+            raise VerticeInvalidoException('O vértice ' + str(v) + ' não pertence ao grafo')
+        return i
 
     @classmethod
     def verticeValido(self, vertice: str):
@@ -113,39 +222,7 @@ class Grafo:
         :param vertice: O vértice que deve ser verificado.
         :return: Um valor booleano que indica se o vértice existe no grafo.
         '''
-        return Grafo.verticeValido(vertice) and self.N.count(vertice) > 0
-
-    def __primeiro_vertice_aresta(self, a: str):
-        '''
-        Dada uma aresta no formato X-Y, retorna o vértice X
-        :param a: a aresta a ser analisada
-        :return: O primeiro vértice da aresta
-        '''
-        return a[0:a.index(Grafo.SEPARADOR_ARESTA)]
-
-    def __segundo_vertice_aresta(self, a: str):
-        '''
-        Dada uma aresta no formato X-Y, retorna o vértice Y
-        :param a: A aresta a ser analisada
-        :return: O segundo vértice da aresta
-        '''
-        return a[a.index(Grafo.SEPARADOR_ARESTA) + 1:]
-
-    def __indice_primeiro_vertice_aresta(self, a: str):
-        '''
-        Dada uma aresta no formato X-Y, retorna o índice do vértice X na lista de vértices
-        :param a: A aresta a ser analisada
-        :return: O índice do primeiro vértice da aresta na lista de vértices
-        '''
-        return self.N.index(self.__primeiro_vertice_aresta(a))
-
-    def __indice_segundo_vertice_aresta(self, a: str):
-        '''
-        Dada uma aresta no formato X-Y, retorna o índice do vértice Y na lista de vértices
-        :param a: A aresta a ser analisada
-        :return: O índice do segundo vértice da aresta na lista de vértices
-        '''
-        return self.N.index(self.__segundo_vertice_aresta(a))
+        return self.indice_vertice(vertice) is not None
 
     def existeAresta(self, a: str):
         '''
@@ -153,14 +230,14 @@ class Grafo:
         :param aresta: A aresta a ser verificada
         :return: Um valor booleano que indica se a aresta existe no grafo.
         '''
-        existe = False
-        if Grafo.arestaValida(self, a):
-            for i in range(len(self.M)):
-                for j in range(len(self.M)):
-                    if self.M[self.__indice_primeiro_vertice_aresta(a)][self.__indice_segundo_vertice_aresta(a)]:
-                        existe = True
+        indices = self._indices_aresta(a)
+        if indices is None:
+            return False
+
+        i_a1, i_a2 = indices
 
-        return existe
+        # Apenas a parte da matriz acima da diagonal principal guarda a quantidade de arestas
+        return self.M[min(i_a1, i_a2)][max(i_a1, i_a2)] > 0
 
     def adicionaVertice(self, v):
         '''
@@ -168,24 +245,38 @@ class Grafo:
         :param v: O vértice a ser incluído no grafo.
         :raises VerticeInvalidoException se o vértice já existe ou se ele não estiver no formato válido.
         '''
-        if v in self.N:
-            raise VerticeInvalidoException('O vértice {} já existe'.format(v))
+        self.adicionaVertices([v])
+
+    def adicionaVertices(self, lista):
+        '''
+        Inclui de uma só vez vários vértices no grafo, aumentando a matriz uma única vez.
+        Nenhum vértice é incluído se algum deles for inválido.
+        :param lista: Os vértices a serem incluídos no grafo.
+        :raises VerticeInvalidoException se algum vértice já existe ou se ele não estiver no formato válido.
+        '''
+        novos = set()
+        existentes = set(self.N)
+        for v in lista:
+            if v in existentes or v in novos:
+                raise VerticeInvalidoException('O vértice {} já existe'.format(v))
+            if not self.verticeValido(v):
+                raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
+            novos.add(v)
 
-        if self.verticeValido(v):
+        for v in lista:
             if len(v) > self.__maior_vertice:
                 self.__maior_vertice = len(v)
 
-            self.N.append(v)  # Adiciona vértice na lista de vértices
-            self.M.append([])  # Adiciona a linha
+        total = len(self.N) + len(lista)
 
-            for k in range(len(self.N)):
-                if k != len(self.N) - 1:
-                    self.M[k].append(0)  # adiciona os elementos da coluna do vértice
-                    self.M[self.N.index(v)].append('-')  # adiciona os elementos da linha do vértice
-                else:
-                    self.M[self.N.index(v)].append(0)  # adiciona um zero no último elemento da linha
-        else:
-            raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
+        zeros = [0] * len(lista)
+        for linha in self.M:
+            linha.extend(zeros)  # adiciona os elementos das colunas dos novos vértices
+
+        for v in lista:
+            # Adiciona a linha do vértice, com '-' abaixo da diagonal principal
+            self.M.append([self.SEPARADOR_ARESTA] * len(self.N) + [0] * (total - len(self.N)))
+            self.N.append(v)  # Adiciona vértice na lista de vértices
 
     def adicionaAresta(self, a):
         '''
@@ -193,13 +284,15 @@ class Grafo:
         :param a: a aresta no formato correto
         :raise: lança uma exceção caso a aresta não estiver em um formato válido
         '''
-        if self.arestaValida(a):
-            i_a1 = self.__indice_primeiro_vertice_aresta(a)
-            i_a2 = self.__indice_segundo_vertice_aresta(a)
-            if i_a1 < i_a2:
-                self.M[i_a1][i_a2] += 1
-            else:
-                self.M[i_a2][i_a1] += 1
+        indices = self._indices_aresta(a)
+        if indices is not None:
+            i_a1, i_a2 = min(indices), max(indices)
+            self.__atualiza_contadores(i_a1, i_a2, self.M[i_a1][i_a2], 1)
+            self.M[i_a1][i_a2] += 1
+            self.__atualiza_graus(i_a1, i_a2, 1)
+            if self.__pai is not None:
+                self.__conjuntos()
+                self.__une(i_a1, i_a2)
         else:
             raise ArestaInvalidaException('A aresta {} é inválida'.format(a))
 
@@ -209,14 +302,16 @@ class Grafo:
         :param a: a aresta no formato correto
         :raise: lança uma exceção caso a aresta não estiver em um formato válido
         '''
-        if self.arestaValida(a):
-            if self.existeAresta(a):
-                i_a1 = self.__indice_primeiro_vertice_aresta(a)
-                i_a2 = self.__indice_segundo_vertice_aresta(a)
-                if i_a1 < i_a2:
-                    self.M[i_a1][i_a2] -= 1
-                else:
-                    self.M[i_a2][i_a1] -= 1
+        indices = self._indices_aresta(a)
+        if indices is not None:
+            i_a1, i_a2 = min(indices), max(indices)
+            if self.M[i_a1][i_a2] > 0:
+                self.__atualiza_contadores(i_a1, i_a2, self.M[i_a1][i_a2], -1)
+                self.M[i_a1][i_a2] -= 1
+                self.__atualiza_graus(i_a1, i_a2, -1)
+                if not self.M[i_a1][i_a2] > 0:
+                    # Sem outra aresta entre os dois vértices, a componente pode ter se separado
+                    self.__pai = None
         else:
             raise ArestaInvalidaException('A aresta {} é inválida'.format(a))
 
@@ -232,102 +327,307 @@ class Grafo:
             print()
 
     def grau(self, v):
-        cont = 0
-        indice_do_vertice = self.N.index(v)
-
-        for i in self.M[indice_do_vertice]:
-            if i != self.SEPARADOR_ARESTA:
-                cont += i
-
-        for i in self.M:
-            if self.M.index(i) != indice_do_vertice and i[indice_do_vertice] != self.SEPARADOR_ARESTA:
-                cont += i[indice_do_vertice]
+        return self.__vetor_graus()[self.__indice_existente(v)]
 
-        return cont
+    def graus(self):
+        '''
+        Fornece o grau de todos os vértices. Um laço contribui com 2 para o grau do seu vértice.
+        :return: Uma lista com os graus, na ordem da lista de vértices.
+        '''
+        return list(self.__vetor_graus())
 
-    def arestas_sobre_vertice(self, v):
-        lista = []
+    def __vetor_graus(self):
+        '''
+        Fornece o vetor de graus mantido pelo grafo, calculando-o a partir da matriz apenas na primeira vez.
+        Vértices incluídos depois do cálculo ainda não têm arestas, então entram com grau zero.
+        :return: A lista interna de graus. Não deve ser alterada.
+        '''
+        if self.__graus is None:
+            self.__graus = self._calcula_graus()
+        elif len(self.__graus) < len(self.N):
+            self.__graus.extend([0] * (len(self.N) - len(self.__graus)))
+        return self.__graus
 
-        vert = self.N
-        vindx = vert.index(v)
+    def _calcula_graus(self):
+        '''
+        Calcula o grau de todos os vértices somando a linha e a coluna de cada um na parte da matriz acima da diagonal.
+        Subclasses com outra forma de armazenar a matriz podem sobrescrever este método.
+        :return: Uma lista com os graus, na ordem da lista de vértices.
+        '''
+        graus = [0] * len(self.N)
+        for i in range(len(self.M)):
+            linha = self.M[i]
+            for j in range(i, len(linha)):
+                if linha[j]:
+                    # Na diagonal i == j, então o laço é somado duas vezes
+                    graus[i] += linha[j]
+                    graus[j] += linha[j]
+        return graus
+
+    def __atualiza_graus(self, i, j, variacao):
+        '''
+        Atualiza o vetor de graus, se ele já tiver sido calculado, após incluir ou remover uma aresta entre os vértices de índices i e j.
+        '''
+        if self.__graus is not None:
+            graus = self.__vetor_graus()
+            graus[i] += variacao
+            graus[j] += variacao
 
-        x = self.M[vindx]
+    def __vetor_contadores(self):
+        '''
+        Fornece os contadores mantidos pelo grafo, calculando-os a partir da matriz apenas na primeira vez.
+        :return: A lista interna [pares de vértices distintos adjacentes, laços, arestas paralelas, arestas]. Não deve ser alterada.
+        '''
+        if self.__contadores is None:
+            self.__contadores = self._calcula_contadores()
+        return self.__contadores
 
+    def _calcula_contadores(self):
+        '''
+        Calcula os contadores estruturais do grafo percorrendo a parte da matriz acima da diagonal.
+        Uma célula com m arestas contribui com m - 1 arestas paralelas.
+        Subclasses com outra forma de armazenar a matriz podem sobrescrever este método.
+        :return: Uma lista [pares de vértices distintos adjacentes, laços, arestas paralelas, arestas].
+        '''
+        contadores = [0, 0, 0, 0]
         for i in range(len(self.M)):
-            y = self.M[i]
-            if y[vindx] != self.SEPARADOR_ARESTA and y[vindx] > 0:
-                for j in range(y[vindx]):
-                    lista.append(self.N[i] + self.SEPARADOR_ARESTA + v)
+            linha = self.M[i]
+            for j in range(i, len(linha)):
+                if linha[j]:
+                    if i == j:
+                        contadores[1] += linha[j]
+                    else:
+                        contadores[0] += 1
+                    contadores[2] += linha[j] - 1
+                    contadores[3] += linha[j]
+        return contadores
 
-        for i in range(len(x)):
-            if x[i] != self.SEPARADOR_ARESTA and x[i] > 0:
-                for j in range(x[i]):
-                    lista.append(v + self.SEPARADOR_ARESTA + vert[i])
+    def __atualiza_contadores(self, i, j, anterior, variacao):
+        '''
+        Atualiza os contadores, se já tiverem sido calculados, antes de incluir (variacao = 1) ou remover (variacao = -1) uma aresta
+        entre os vértices de índices i <= j.
+        :param anterior: A quantidade de arestas entre i e j antes da alteração.
+        '''
+        if self.__contadores is None:
+            return
+        contadores = self.__contadores
+        # A primeira aresta de um par muda a quantidade de pares adjacentes; as demais são paralelas
+        if (anterior if variacao > 0 else anterior - 1) > 0:
+            contadores[2] += variacao
+        elif i != j:
+            contadores[0] += variacao
+        if i == j:
+            contadores[1] += variacao
+        contadores[3] += variacao
+
+    def qtde_arestas(self):
+        '''
+        Fornece a quantidade de arestas do grafo, contando laços e arestas paralelas, em O(1).
+        '''
+        return self.__vetor_contadores()[3]
 
-        return lista
+    def ha_laco(self):
+        return self.__vetor_contadores()[1] > 0
 
-    def eh_completo(self):
+    def ha_paralelas(self):
+        return self.__vetor_contadores()[2] > 0
 
-        for x in range(len(self.M)):
-            q = len(self.N) - (x + 1)
-            cont = 0
-            contlaco = 0
+    def eh_simples(self):
+        '''
+        Verifica em O(1) se o grafo é simples, ou seja, se não tem laços nem arestas paralelas.
+        '''
+        contadores = self.__vetor_contadores()
+        return contadores[1] == 0 and contadores[2] == 0
 
-            linha = self.M[x]
-            for y in range(len(linha)):
-                if linha[y] != self.SEPARADOR_ARESTA and linha[y] > 0 and x != y:
-                    cont += 1
-                    if x == y and linha[y] > 0:
-                        contlaco += 1
+    def arestas_sobre_vertice(self, v):
+        k = self.__indice_existente(v)
+        return [self.__aresta(k, j) for j in self.__incidencias(k)]
 
-            if cont != (q + contlaco) and cont != q:
-                return False
+    def __incidencias(self, k):
+        '''
+        Gera o índice do vizinho de cada aresta que incide sobre o vértice de índice k, na ordem de arestas_sobre_vertice.
+        Um vizinho ligado por arestas paralelas aparece uma vez para cada aresta, e um laço aparece duas vezes.
+        :param k: O índice do vértice na lista de vértices
+        '''
+        # A coluna k acima da diagonal guarda as arestas com os vértices anteriores e a linha k as arestas com os seguintes
+        for i in range(k + 1):
+            for _ in range(self.M[i][k]):
+                yield i
 
-        return True
-    
+        linha = self.M[k]
+        for j in range(k, len(linha)):
+            for _ in range(linha[j]):
+                yield j
+
+    def eh_completo(self):
+        '''
+        Verifica em O(1), pelos contadores mantidos pelo grafo, se todo par de vértices distintos é adjacente.
+        Laços e arestas paralelas não impedem que o grafo seja completo.
+        '''
+        n = len(self.N)
+        return self.__vetor_contadores()[0] == n * (n - 1) // 2
 
     def vertices_adjacentes(self, v):
-        ares = self.arestas_sobre_vertice(v)
-        for i in range(len(ares)):
-            a = ares[i].split(self.SEPARADOR_ARESTA)
-            if a[0] == v:
-                ares[i] = a[1]
-            elif a[1] == v:
-                ares[i] = a[0]
-        return ares
+        return [self.N[j] for j in self.__incidencias(self.__indice_existente(v))]
 
     def dfs_tree(self, r):
-        retorno = [r]
-        return self.dfs_recursao(r, retorno)
+        return list(self.percurso_dfs(r))
 
-        
     def dfs_recursao(self, raiz, retorno):
-        cont = 2
-        vertices_adjacentes = self.vertices_adjacentes(raiz)
-        arestas_sobre_vertice = self.arestas_sobre_vertice(raiz)
+        visitados = {self.indice_vertice(v) for v in retorno}
+        visitados.discard(None)
+        retorno.extend(self.__dfs(self.__indice_existente(raiz), visitados))
+        return retorno
 
-        for i in range(0, len(vertices_adjacentes)):
-                if vertices_adjacentes[i] not in retorno :
-                    retorno.append(arestas_sobre_vertice[i])
-                    retorno.append(vertices_adjacentes[i])
-                    cont-=1
+    def percurso_dfs(self, r):
+        '''
+        Percorre o grafo em profundidade a partir de um vértice usando uma pilha explícita, sem recursão.
+        :param r: O vértice raiz do percurso.
+        :return: Um gerador com a raiz seguida, para cada vértice descoberto, da aresta usada para alcançá-lo e do próprio vértice.
+        '''
+        k = self.__indice_existente(r)
+        yield r
+        yield from self.__dfs(k, {k})
 
-                    retorno = self.dfs_recursao(vertices_adjacentes[i], retorno)
+    def __dfs(self, raiz, visitados):
+        '''
+        Gera as arestas e vértices descobertos pela busca em profundidade a partir da raiz.
+        :param raiz: O índice do vértice onde a busca começa.
+        :param visitados: Conjunto dos índices dos vértices já visitados. É atualizado durante a busca.
+        '''
+        pilha = [(raiz, self.__incidencias(raiz))]
+        while pilha:
+            u, incidencias = pilha[-1]
+            for vizinho in incidencias:
+                if vizinho not in visitados:
+                    visitados.add(vizinho)
+                    yield self.__aresta(u, vizinho)
+                    yield self.N[vizinho]
+                    pilha.append((vizinho, self.__incidencias(vizinho)))
+                    break
+            else:
+                pilha.pop()
 
-        return retorno
+    def percurso_bfs(self, r):
+        '''
+        Percorre o grafo em largura a partir de um vértice.
+        :param r: O vértice raiz do percurso.
+        :return: Um gerador com a raiz seguida, para cada vértice descoberto, da aresta usada para alcançá-lo e do próprio vértice.
+        '''
+        k = self.__indice_existente(r)
+        yield r
+        visitados = bytearray(len(self.N))
+        visitados[k] = 1
+        fila = deque([k])
+        while fila:
+            atual = fila.popleft()
+            for vizinho in self.__incidencias(atual):
+                if not visitados[vizinho]:
+                    visitados[vizinho] = 1
+                    yield self.__aresta(atual, vizinho)
+                    yield self.N[vizinho]
+                    fila.append(vizinho)
 
     def eh_conexo(self):
-        for i in self.N:
-            for j in self.N:
-                if not self.caminho_dois_vertices(i, j):
-                    return False
-        return True
+        self.__conjuntos()
+        return self.__qtde_componentes <= 1
+
+    def componentes_conexas(self):
+        '''
+        Identifica as componentes conexas do grafo a partir dos conjuntos disjuntos mantidos pelo grafo.
+        :return: Um dicionário que associa cada vértice ao número (a partir de 0) da componente conexa a que ele pertence.
+        As componentes são numeradas na ordem em que aparecem na lista de vértices.
+        '''
+        self.__conjuntos()
+        rotulos = {}
+        componentes = {}
+        for i in range(len(self.N)):
+            raiz = self.__raiz(i)
+            if raiz not in rotulos:
+                rotulos[raiz] = len(rotulos)
+            componentes[self.N[i]] = rotulos[raiz]
+        return componentes
+
+    def indice_vertice(self, v):
+        '''
+        Dado um vértice, retorna o seu índice na lista de vértices consultando um dicionário em vez de percorrer a lista.
+        :param v: O vértice a ser procurado
+        :return: O índice do vértice ou None se ele não pertencer ao grafo
+        '''
+        for i in range(len(self.__indices), len(self.N)):
+            self.__indices[self.N[i]] = i
+        return self.__indices.get(v)
+
+    def __conjuntos(self):
+        '''
+        Monta os conjuntos disjuntos das componentes conexas, se ainda não estiverem montados, a partir dos pares de vértices adjacentes.
+        Vértices incluídos depois da montagem ainda não têm arestas, então entram como conjuntos unitários.
+        '''
+        if self.__pai is None:
+            self.__pai = list(range(len(self.N)))
+            self.__tamanho = [1] * len(self.N)
+            self.__qtde_componentes = len(self.N)
+            for i, j in self._pares_adjacentes():
+                self.__une(i, j)
+        else:
+            for i in range(len(self.__pai), len(self.N)):
+                self.__pai.append(i)
+                self.__tamanho.append(1)
+                self.__qtde_componentes += 1
+
+    def _pares_adjacentes(self):
+        '''
+        Gera os pares de índices (i, j), com i < j, dos vértices ligados por pelo menos uma aresta.
+        Subclasses com outra forma de armazenar a matriz podem sobrescrever este método.
+        '''
+        for i in range(len(self.M)):
+            linha = self.M[i]
+            # compress filtra as colunas não nulas sem um laço em Python sobre a linha inteira
+            for j in compress(range(i + 1, len(linha)), islice(linha, i + 1, None)):
+                yield i, j
+
+    def __raiz(self, i):
+        '''
+        Encontra o representante do conjunto do vértice de índice i, encurtando pela metade o caminho percorrido até ele.
+        '''
+        pai = self.__pai
+        while pai[i] != i:
+            pai[i] = pai[pai[i]]
+            i = pai[i]
+        return i
+
+    def __une(self, i, j):
+        '''
+        Une os conjuntos dos vértices de índices i e j, pendurando o menor conjunto no maior.
+        '''
+        raiz_i = self.__raiz(i)
+        raiz_j = self.__raiz(j)
+        if raiz_i == raiz_j:
+            return
+        if self.__tamanho[raiz_i] < self.__tamanho[raiz_j]:
+            raiz_i, raiz_j = raiz_j, raiz_i
+        self.__pai[raiz_j] = raiz_i
+        self.__tamanho[raiz_i] += self.__tamanho[raiz_j]
+        self.__qtde_componentes -= 1
+
+    def __indices_adjacentes(self, k):
+        '''
+        Gera os índices dos vértices adjacentes ao vértice de índice k, lendo apenas a parte da matriz acima da diagonal.
+        :param k: O índice do vértice na lista de vértices
+        '''
+        for j in range(k):
+            if self.M[j][k] > 0:
+                yield j
+        linha = self.M[k]
+        for j in range(k + 1, len(linha)):
+            if linha[j] > 0:
+                yield j
 
     def pares_e_impares(self, x):
         lista_de_pares = []
         lista_de_impares = []
-        for i in self.N:
-            if self.grau(i) % 2 == 0:
+        for i, grau in zip(self.N, self.__vetor_graus()):
+            if grau % 2 == 0:
                 lista_de_pares.append(i)
             else:
                 lista_de_impares.append(i)
@@ -336,45 +636,278 @@ class Grafo:
         elif x == "par":
             return lista_de_pares
 
-    def caminhos_possiveis(self, inicio, fim):
-        import copy
-        caminho = []
-        matriz = copy.deepcopy(self.M)
-        while (True):
-            current = inicio
-            adj = self.vertices_adjacentes(inicio)
-            for v in adj:
-                caminho.append([])
-
     def caminho_dois_vertices(self, x, y):
-        dfs_comparacao = self.dfs_tree(x)
-        if y in dfs_comparacao:
-            return True
-        else:
+        i = self.indice_vertice(x)
+        j = self.indice_vertice(y)
+        if i is None or j is None:
             return False
+        self.__conjuntos()
+        return self.__raiz(i) == self.__raiz(j)
 
     def ha_caminho_euler(self):
-        lista_de_impares = self.pares_e_impares("impar")
-        qt_impares = len[lista_de_impares]
+        graus = self.__vetor_graus()
+        qt_impares = 0
+        for grau in graus:
+            qt_impares += grau % 2
         if qt_impares != 2 and qt_impares != 0:
             return False
-        return True
+
+        # Todas as arestas precisam estar na mesma componente conexa
+        componentes = set()
+        for rotulo, grau in zip(self.componentes_conexas().values(), graus):
+            if grau > 0:
+                componentes.add(rotulo)
+        return len(componentes) <= 1
+
+    def caminho_euler(self):
+        '''
+        Constrói um caminho (ou circuito) de Euler com o algoritmo de Hierholzer, em tempo linear no número de arestas.
+        O caminho começa num vértice de grau ímpar, se houver, e cada aresta é escrita no sentido em que é percorrida.
+        :return: Uma lista com as arestas no formato X-Y na ordem do percurso ou False se o grafo não tiver caminho de Euler.
+        '''
+        if not self.ha_caminho_euler():
+            return False
+
+        # Numera as arestas: extremos[a] guarda os índices dos vértices da aresta a e incidentes[i] as arestas que tocam o vértice i
+        extremos = []
+        incidentes = [[] for _ in self.N]
+        for i in range(len(self.M)):
+            linha = self.M[i]
+            for j in range(i, len(linha)):
+                for _ in range(int(linha[j])):
+                    incidentes[i].append(len(extremos))
+                    if i != j:
+                        incidentes[j].append(len(extremos))
+                    extremos.append((i, j))
+
+        if not extremos:
+            return []
+
+        graus = self.__vetor_graus()
+        inicio = extremos[0][0]
+        for i in range(len(graus)):
+            if graus[i] % 2 == 1:
+                inicio = i
+                break
+
+        usada = bytearray(len(extremos))
+        proxima = [0] * len(self.N)
+        pilha = [(inicio, None)]
+        caminho = []
+        while pilha:
+            u, chegada = pilha[-1]
+            arestas = incidentes[u]
+            while proxima[u] < len(arestas) and usada[arestas[proxima[u]]]:
+                proxima[u] += 1
+            if proxima[u] == len(arestas):
+                pilha.pop()
+                if chegada is not None:
+                    caminho.append(chegada)
+            else:
+                a = arestas[proxima[u]]
+                usada[a] = 1
+                x, y = extremos[a]
+                w = y if x == u else x
+                pilha.append((w, self.N[u] + self.SEPARADOR_ARESTA + self.N[w]))
+
+        caminho.reverse()
+        return caminho
     
+    def fecho_transitivo(self):
+        '''
+        Calcula o fecho transitivo (matriz de alcançabilidade) do grafo.
+        Como o grafo não é direcionado, o algoritmo de Warshall sempre termina com a mesma matriz: o vértice j é alcançável a partir
+        do vértice i se os dois estão na mesma componente conexa e i tem pelo menos uma aresta (com ela, i também alcança a si mesmo).
+        Por isso o fecho é montado diretamente a partir dos conjuntos disjuntos das componentes conexas mantidos pelo grafo, sem as
+        V iterações do Warshall, comparando o rótulo da componente de cada par de vértices de uma só vez com o NumPy.
+        :return: Um array V x V do NumPy do tipo bool onde o elemento [i, j] é True se existe um caminho com pelo menos uma aresta
+        entre o vértice i e o vértice j.
+        '''
+        import numpy as np
+
+        self.__conjuntos()
+        rotulos = np.empty(len(self.N), dtype=np.int64)
+        for i in range(len(self.N)):
+            raiz = self.__raiz(i)
+            # Um vértice sem arestas está sozinho na sua componente e não tem laço, então não alcança nenhum vértice
+            rotulos[i] = raiz if self.__tamanho[raiz] > 1 or self.M[i][i] else -1
+
+        fecho = rotulos[:, np.newaxis] == rotulos
+        fecho[rotulos < 0] = False
+        return fecho
+
+    def distancias(self, metodo=None, bloco=256):
+        '''
+        Calcula a distância (quantidade de arestas do menor caminho) entre todos os pares de vértices.
+        O algoritmo de Floyd-Warshall é executado sobre um array do NumPy, atualizando a matriz inteira a cada vértice intermediário
+        com np.minimum e, para matrizes maiores que bloco, por blocos que cabem na cache. Em grafos esparsos é mais barato fazer uma
+        busca em largura a partir de cada vértice, e esse é o método escolhido automaticamente quando há poucas arestas.
+        :param metodo: 'floyd', 'bfs' ou None para escolher automaticamente.
+        :param bloco: O tamanho dos blocos do Floyd-Warshall.
+        :return: Um array V x V do NumPy. Se houver menos de 32767 vértices ele é do tipo int16 e pares sem caminho valem -1;
+        caso contrário ele é do tipo float32 e pares sem caminho valem infinito.
+        '''
+        import numpy as np
+
+        n = len(self.N)
+        pares = list(self._pares_adjacentes())
+
+        if metodo is None:
+            metodo = 'bfs' if len(pares) < Grafo.DENSIDADE_BFS * n * n else 'floyd'
+
+        if metodo == 'bfs':
+            adjacentes = [[] for _ in range(n)]
+            for i, j in pares:
+                adjacentes[i].append(j)
+                adjacentes[j].append(i)
+            d = np.full((n, n), np.inf, dtype=np.float32)
+            for origem in range(n):
+                linha = [-1] * n
+                linha[origem] = 0
+                fila = deque([origem])
+                while fila:
+                    u = fila.popleft()
+                    for w in adjacentes[u]:
+                        if linha[w] == -1:
+                            linha[w] = linha[u] + 1
+                            fila.append(w)
+                linha = np.array(linha, dtype=np.float32)
+                linha[linha < 0] = np.inf
+                d[origem] = linha
+        elif metodo == 'floyd':
+            d = np.full((n, n), np.inf, dtype=np.float32)
+            np.fill_diagonal(d, 0)
+            for i, j in pares:
+                d[i, j] = d[j, i] = 1
+            Grafo.__floyd_warshall(d, bloco)
+        else:
+            raise ValueError('Método de cálculo de distâncias desconhecido: {}'.format(metodo))
+
+        if n < np.iinfo(np.int16).max:
+            compacta = np.full((n, n), -1, dtype=np.int16)
+            alcancavel = np.isfinite(d)
+            compacta[alcancavel] = d[alcancavel]
+            return compacta
+        return d
+
+    @staticmethod
+    def __floyd_warshall(d, bloco):
+        '''
+        Executa o algoritmo de Floyd-Warshall sobre a matriz de distâncias d, alterando-a.
+        Para cada bloco de vértices intermediários K, primeiro são atualizadas as linhas e as colunas de K e depois, com elas prontas,
+        cada bloco restante da matriz recebe todas as atualizações de K enquanto ainda está na cache.
+        :param d: Um array V x V do NumPy com as distâncias iniciais (infinito para pares sem aresta).
+        :param bloco: O tamanho dos blocos.
+        '''
+        import numpy as np
+
+        n = len(d)
+        if n <= bloco:
+            for k in range(n):
+                np.minimum(d, d[:, k, None] + d[None, k, :], out=d)
+            return
+
+        blocos = [slice(inicio, min(inicio + bloco, n)) for inicio in range(0, n, bloco)]
+        for K in blocos:
+            linhas_k = d[K, :]
+            for k in range(K.start, K.stop):
+                np.minimum(linhas_k, d[K, k, None] + d[None, k, :], out=linhas_k)
+            colunas_k = d[:, K]
+            for k in range(K.start, K.stop):
+                np.minimum(colunas_k, d[:, k, None] + d[None, k, K], out=colunas_k)
+            for I in blocos:
+                if I == K:
+                    continue
+                for J in blocos:
+                    if J == K:
+                        continue
+                    parte = d[I, J]
+                    for k in range(K.start, K.stop):
+                        np.minimum(parte, d[I, k, None] + d[None, k, J], out=parte)
+
     def ha_pontes(self):
-        import copy
+        pontes, _, _ = self.__low_link()
+        return [self.N[x] + self.SEPARADOR_ARESTA + self.N[y] for x, y in pontes]
+
+    def pontos_de_articulacao(self):
+        '''
+        Encontra os vértices cuja remoção aumenta o número de componentes conexas do grafo.
+        :return: Uma lista com os pontos de articulação, na ordem da lista de vértices.
+        '''
+        _, articulacoes, _ = self.__low_link()
+        return [self.N[i] for i in range(len(self.N)) if articulacoes[i]]
+
+    def componentes_biconexas(self):
+        '''
+        Separa as arestas do grafo em componentes biconexas. Laços e vértices isolados são ignorados.
+        :return: Uma lista com os vértices de cada componente biconexa, na ordem da lista de vértices.
+        '''
+        _, _, biconexas = self.__low_link()
+        return [[self.N[i] for i in sorted(componente)] for componente in biconexas]
+
+    def __low_link(self):
+        '''
+        Executa uma única busca em profundidade (iterativa) calculando o tempo de descoberta e o low-link de cada vértice (algoritmo de Tarjan).
+        Arestas paralelas contam como caminho de volta ao pai, então nunca são pontes.
+        :return: Uma tupla com a lista ordenada de pontes (pares de índices x < y), a lista de booleanos que indica os pontos
+        de articulação e a lista de conjuntos de índices de cada componente biconexa.
+        '''
+        n = len(self.N)
+        descoberta = [-1] * n
+        low = [0] * n
+        tempo = 0
         pontes = []
-        matriz = copy.deepcopy(self.M)
-        for x in range(len(self.M)):
-            for y in range(len(self.M[x])):
-                aresta = self.M[x][y]
-                aresta_str = self.N[x] + self.SEPARADOR_ARESTA + self.N[y]
-                if aresta==1 and aresta!=self.SEPARADOR_ARESTA:
-                    self.remove_aresta(aresta_str)
-                    if not self.eh_conexo():
-                        pontes.append(aresta_str)
-                    self.M = copy.deepcopy(matriz)
-
-        return pontes
+        articulacoes = [False] * n
+        biconexas = []
+        pilha_arestas = []
+
+        for raiz in range(n):
+            if descoberta[raiz] != -1:
+                continue
+            descoberta[raiz] = low[raiz] = tempo
+            tempo += 1
+            filhos_raiz = 0
+            pilha = [(raiz, -1, self.__indices_adjacentes(raiz))]
+
+            while pilha:
+                u, pai, vizinhos = pilha[-1]
+                for w in vizinhos:
+                    if descoberta[w] == -1:
+                        pilha_arestas.append((u, w))
+                        descoberta[w] = low[w] = tempo
+                        tempo += 1
+                        pilha.append((w, u, self.__indices_adjacentes(w)))
+                        break
+                    if w != pai or self.M[min(u, w)][max(u, w)] > 1:
+                        if descoberta[w] < descoberta[u]:
+                            pilha_arestas.append((u, w))
+                        low[u] = min(low[u], descoberta[w])
+                else:
+                    pilha.pop()
+                    if pai == -1:
+                        continue
+                    low[pai] = min(low[pai], low[u])
+                    if low[u] > descoberta[pai]:
+                        pontes.append((min(pai, u), max(pai, u)))
+                    if low[u] >= descoberta[pai]:
+                        if pai == raiz:
+                            filhos_raiz += 1
+                        else:
+                            articulacoes[pai] = True
+                        componente = set()
+                        while True:
+                            x, y = pilha_arestas.pop()
+                            componente.add(x)
+                            componente.add(y)
+                            if (x, y) == (pai, u):
+                                break
+                        biconexas.append(componente)
+
+            if filhos_raiz > 1:
+                articulacoes[raiz] = True
+
+        pontes.sort()
+        return pontes, articulacoes, biconexas
 
     def __str__(self):
         '''
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from grafo_adj_nao_dir import Grafo, VerticeInvalidoException, ArestaInvalidaException, MatrizInvalidaException
+
+
+class GrafoNumPy(Grafo):
+    '''
+    Grafo não direcionado representado por uma matriz de adjacência guardada num array contíguo do NumPy.
+    Apenas a parte da matriz acima da diagonal principal (incluindo a diagonal) é usada; abaixo dela os valores são sempre zero.
+    O array tem uma capacidade que dobra quando fica cheio, e M é uma visão das primeiras len(N) linhas e colunas dele.
+    A matriz começa com o tipo inteiro mais compacto e é promovida para um tipo maior quando a quantidade de arestas
+    paralelas não cabe mais nela.
+    '''
+
+    TIPOS_MATRIZ = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+    def __init__(self, V=None, M=None):
+        '''
+        Constrói um objeto do tipo GrafoNumPy; Se nenhum parâmetro for passado, cria um Grafo vazio.
+        Se houver algum vértice inválido ou a matriz não tiver o formato correto, uma exceção é lançada.
+        :param V: Uma lista dos vértices (ou nodos) do grafo.
+        :param M: Uma matriz de adjacência no mesmo formato aceito por Grafo (com '-' abaixo da diagonal) ou um array do NumPy
+        cuja parte abaixo da diagonal principal seja zero.
+        '''
+        super().__init__()
+
+        if V == None:
+            V = list()
+
+        for v in V:
+            if not (Grafo.verticeValido(v)):
+                raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
+
+        if len(set(V)) != len(V):
+            raise VerticeInvalidoException('Há vértices repetidos na lista de vértices')
+
+        self.N = list(V)
+        n = len(self.N)
+
+        if M is None or (not isinstance(M, np.ndarray) and M == []):
+            self.__matriz = np.zeros((n, n), dtype=self.TIPOS_MATRIZ[0])
+            self.M = self.__matriz
+            return
+
+        if len(M) != n:
+            raise MatrizInvalidaException('A matriz passada como parâmetro não tem o tamanho correto')
+
+        maior = 0
+        for i in range(n):
+            linha = M[i]
+            if len(linha) != n:
+                raise MatrizInvalidaException('A matriz passada como parâmetro não tem o tamanho correto')
+            for j in range(i):
+                if not (linha[j] == Grafo.SEPARADOR_ARESTA or linha[j] == 0):
+                    raise MatrizInvalidaException('A matriz não representa uma matriz não direcionada')
+            maior = max(maior, max(linha[i:]))
+
+        self.__matriz = np.zeros((n, n), dtype=self.__tipo_para(maior))
+        for i in range(n):
+            self.__matriz[i, i:] = M[i][i:]
+        self.M = self.__matriz
+
+    def __tipo_para(self, valor):
+        '''
+        Escolhe o menor tipo inteiro da matriz capaz de guardar o valor passado.
+        :param valor: A maior quantidade de arestas entre dois vértices
+        :return: O tipo do NumPy a ser usado na matriz
+        '''
+        for tipo in self.TIPOS_MATRIZ:
+            if valor <= np.iinfo(tipo).max:
+                return tipo
+        raise MatrizInvalidaException('A matriz tem mais arestas paralelas do que é possível representar')
+
+    def adicionaVertices(self, lista):
+        '''
+        Inclui de uma só vez vários vértices no grafo. Se a capacidade da matriz não for suficiente, ela é realocada
+        com o dobro do tamanho, o que torna a inclusão de um vértice por vez O(V) amortizado.
+        Nenhum vértice é incluído se algum deles for inválido.
+        :param lista: Os vértices a serem incluídos no grafo.
+        :raises VerticeInvalidoException se algum vértice já existe ou se ele não estiver no formato válido.
+        '''
+        novos = set()
+        existentes = set(self.N)
+        for v in lista:
+            if v in existentes or v in novos:
+                raise VerticeInvalidoException('O vértice {} já existe'.format(v))
+            if not self.verticeValido(v):
+                raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
+            novos.add(v)
+
+        n = len(self.N)
+        total = n + len(lista)
+        capacidade = len(self.__matriz)
+
+        if total > capacidade:
+            capacidade = max(total, 2 * capacidade)
+            matriz = np.zeros((capacidade, capacidade), dtype=self.__matriz.dtype)
+            matriz[:n, :n] = self.M
+            self.__matriz = matriz
+
+        self.N.extend(lista)
+        self.M = self.__matriz[:total, :total]
+
+    def adicionaAresta(self, a):
+        '''
+        Adiciona uma aresta ao grafo no formato X-Y, onde X é o primeiro vértice e Y é o segundo vértice
+        :param a: a aresta no formato correto
+        :raise: lança uma exceção caso a aresta não estiver em um formato válido
+        '''
+        indices = self._indices_aresta(a)
+        if indices is None:
+            raise ArestaInvalidaException('A aresta {} é inválida'.format(a))
+
+        i_a1, i_a2 = min(indices), max(indices)
+
+        if self.M[i_a1, i_a2] == np.iinfo(self.M.dtype).max:
+            self.__matriz = self.__matriz.astype(self.__tipo_para(int(self.M[i_a1, i_a2]) + 1))
+            self.M = self.__matriz[:len(self.N), :len(self.N)]
+
+        super().adicionaAresta(a)
+
+    def _calcula_graus(self):
+        # Abaixo da diagonal tudo é zero, então a soma da linha com a da coluna conta o laço duas vezes, como deve ser
+        return (self.M.sum(axis=1, dtype=np.int64) + self.M.sum(axis=0, dtype=np.int64)).tolist()
+
+    def _pares_adjacentes(self):
+        # Abaixo da diagonal tudo é zero, então basta descartar os laços
+        linhas, colunas = np.nonzero(self.M)
+        for i, j in zip(linhas.tolist(), colunas.tolist()):
+            if i != j:
+                yield i, j
+
+    def _calcula_contadores(self):
+        # Abaixo da diagonal tudo é zero, então basta contar as células não nulas fora da diagonal
+        celulas = np.count_nonzero(self.M)
+        diagonal = np.diagonal(self.M)
+        arestas = int(self.M.sum(dtype=np.int64))
+        return [celulas - np.count_nonzero(diagonal), int(diagonal.sum(dtype=np.int64)), arestas - celulas, arestas]
+
+    def __linhas_str(self):
+        '''
+        Gera cada linha da matriz no mesmo formato usado por Grafo, com '-' abaixo da diagonal principal.
+        '''
+        for l in range(len(self.N)):
+            yield [Grafo.SEPARADOR_ARESTA] * l + [str(x) for x in self.M[l, l:]]
+
+    def print(self):
+        print('+', end=' ')
+        for i in self.N:
+            print(i, end=' ')
+        print()
+        for x, linha in enumerate(self.__linhas_str()):
+            print(self.N[x], end=' ')
+            for y in linha:
+                print(y, end=' ')
+            print()
+
+    def __str__(self):
+        '''
+        Fornece uma representação do tipo String do grafo.
+        O String contém um sequência dos vértices separados por vírgula, seguido de uma sequência das arestas no formato padrão.
+        :return: Uma string que representa o grafo
+        '''
+
+        # Dá o espaçamento correto de acordo com o tamanho do string do maior vértice
+        espaco = ' ' * max((len(v) for v in self.N), default=0)
+
+        grafo_str = espaco + ' '
+
+        for v in range(len(self.N)):
+            grafo_str += self.N[v]
+            if v < (len(self.N) - 1):  # Só coloca o espaço se não for o último vértice
+                grafo_str += ' '
+
+        grafo_str += '\n'
+
+        for l, linha in enumerate(self.__linhas_str()):
+            grafo_str += self.N[l] + ' '
+            for c in linha:
+                grafo_str += c + ' '
+            grafo_str += '\n'
+
+        return grafo_str
@@ -0,0 +1,539 @@
+# -*- coding: utf-8 -*-
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+
+class VerticeInvalidoException(Exception):
+    pass
+
+
+class ArestaInvalidaException(Exception):
+    pass
+
+
+class ArquivoInvalidoException(Exception):
+    pass
+
+
+class _TabelaNomes:
+    '''
+    Sequência somente leitura de strings guardadas num buffer binário: o nome de índice i ocupa dados[offsets[i]:offsets[i + 1]]
+    em UTF-8. Cada nome só é decodificado quando é acessado.
+    '''
+
+    def __init__(self, dados, offsets):
+        self.dados = dados
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def bytes_nome(self, i):
+        return bytes(self.dados[self.offsets[i]:self.offsets[i + 1]])
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.bytes_nome(i).decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _IndiceNomes:
+    '''
+    Mapeamento somente leitura de nome para índice sobre uma _TabelaNomes, feito por busca binária em ordem, um array com os
+    índices dos nomes em ordem crescente de bytes.
+    '''
+
+    def __init__(self, tabela, ordem):
+        self.tabela = tabela
+        self.ordem = ordem
+
+    def __busca(self, nome):
+        chave = nome.encode('utf-8')
+        inicio, fim = 0, len(self.ordem)
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            if self.tabela.bytes_nome(self.ordem[meio]) < chave:
+                inicio = meio + 1
+            else:
+                fim = meio
+        if inicio < len(self.ordem) and self.tabela.bytes_nome(self.ordem[inicio]) == chave:
+            return self.ordem[inicio]
+        return None
+
+    def __contains__(self, nome):
+        return self.__busca(nome) is not None
+
+    def __getitem__(self, nome):
+        i = self.__busca(nome)
+        if i is None:
+            raise KeyError(nome)
+        return i
+
+
+class GrafoCSR:
+    '''
+    Grafo não direcionado e imutável no formato CSR (compressed sparse row), adequado para grafos esparsos.
+    Os vizinhos do vértice de índice i ficam em vizinhos[inicio[i]:inicio[i + 1]], em ordem crescente e sem repetição;
+    multiplicidade guarda, na mesma posição, a quantidade de arestas paralelas entre os dois vértices.
+    Um laço aparece uma única vez na lista do próprio vértice, mas, como no Grafo por matriz de adjacência, conta 2 para o grau
+    do vértice e aparece duas vezes em vertices_adjacentes.
+    Quando o grafo vem de um dicionário de arestas, nomes_arestas e pesos guardam o nome e o peso de cada aresta, agrupados por
+    par de vértices na mesma ordem em que os pares aparecem nas listas de vizinhos (só os pares com i <= j), e invertidas guarda 1
+    para as arestas escritas com o vértice de maior índice primeiro, para que to_grafo as devolva no mesmo sentido.
+    Os pesos ficam num array('q') se forem todos inteiros e num array('d') caso contrário.
+    '''
+
+    SEPARADOR_ARESTA = '-'
+    PESO_PADRAO = 1
+
+    ASSINATURA_ARQUIVO = b'GRAFOCSR'
+    VERSAO_ARQUIVO = 2
+    # assinatura, versão, ordem dos bytes, qtde de vértices, qtde de entradas em vizinhos, qtde de arestas nomeadas (-1 se
+    # não houver nomes), tamanho em bytes da tabela de nomes dos vértices, tamanho em bytes da tabela de nomes das arestas e
+    # tipo dos pesos (o código de tipo do array, 'q' ou 'd')
+    CABECALHO_ARQUIVO = struct.Struct('=8sII5qc7x')
+
+    def __init__(self, N=None, A=None, P=None):
+        '''
+        Constrói um objeto do tipo GrafoCSR. Se nenhum parâmetro for passado, cria um Grafo vazio.
+        Se houver alguma aresta ou algum vértice inválido, uma exceção é lançada.
+        :param N: Uma lista dos vértices (ou nodos) do grafo.
+        :param A: Um dicionário com as arestas do grafo, cujas chaves são os nomes das arestas e os valores estão no formato X-Y,
+        ou apenas um iterável com as arestas no formato X-Y. Os nomes das arestas só são guardados no primeiro caso.
+        :param P: Opcional. Um dicionário com o peso de cada aresta nomeada. As arestas ausentes recebem PESO_PADRAO.
+        '''
+        if N == None:
+            N = list()
+        if A == None:
+            A = list()
+        if P == None:
+            P = dict()
+
+        for v in N:
+            if not (GrafoCSR.verticeValido(v)):
+                raise VerticeInvalidoException('O vértice ' + v + ' é inválido')
+
+        self.N = list(N)
+        self.__indice = {v: i for i, v in enumerate(self.N)}
+        self.__arquivo = None
+        self.__primeira_aresta = None
+
+        origens = array('i')
+        destinos = array('i')
+        nomes_par = {} if isinstance(A, dict) else None
+        invertidas = set()
+        for nome, a in (A.items() if nomes_par is not None else zip(A, A)):
+            x, separador, y = a.partition(GrafoCSR.SEPARADOR_ARESTA)
+            if not separador or x not in self.__indice or y not in self.__indice:
+                raise ArestaInvalidaException('A aresta ' + a + ' é inválida')
+            i, j = self.__indice[x], self.__indice[y]
+            origens.append(i)
+            destinos.append(j)
+            if nomes_par is not None:
+                nomes_par.setdefault((min(i, j), max(i, j)), []).append(nome)
+                if i > j:
+                    invertidas.add(nome)
+
+        self.__constroi(origens, destinos)
+
+        self.nomes_arestas = None
+        self.pesos = None
+        self.invertidas = None
+        if nomes_par is not None:
+            self.nomes_arestas = []
+            self.invertidas = array('B')
+            pesos = []
+            for i, j, _ in self.__arestas_indices():
+                for nome in nomes_par[(i, j)]:
+                    self.nomes_arestas.append(nome)
+                    self.invertidas.append(nome in invertidas)
+                    pesos.append(P.get(nome, GrafoCSR.PESO_PADRAO))
+            self.pesos = array('q' if all(isinstance(peso, int) for peso in pesos) else 'd', pesos)
+
+    @classmethod
+    def verticeValido(cls, vertice: str):
+        '''
+        Verifica se um vértice passado como parâmetro está dentro do padrão estabelecido.
+        Um vértice é um string qualquer que não pode ser vazio e nem conter o caractere separador.
+        :param vertice: Um string que representa o vértice a ser analisado.
+        :return: Um valor booleano que indica se o vértice está no formato correto.
+        '''
+        return vertice != '' and vertice.count(GrafoCSR.SEPARADOR_ARESTA) == 0
+
+    def __constroi(self, origens, destinos):
+        '''
+        Monta os arrays do formato CSR a partir das arestas dadas como pares de índices.
+        :param origens: array('i') com o índice do primeiro vértice de cada aresta.
+        :param destinos: array('i') com o índice do segundo vértice de cada aresta.
+        '''
+        n = len(self.N)
+
+        # Conta quantas entradas cada vértice terá e calcula o início da lista de cada um
+        contagem = array('i', bytes(4 * (n + 1)))
+        for x, y in zip(origens, destinos):
+            contagem[x + 1] += 1
+            if x != y:
+                contagem[y + 1] += 1
+        for i in range(n):
+            contagem[i + 1] += contagem[i]
+
+        posicao = array('i', contagem)
+        vizinhos = array('i', bytes(4 * contagem[n]))
+        for x, y in zip(origens, destinos):
+            vizinhos[posicao[x]] = y
+            posicao[x] += 1
+            if x != y:
+                vizinhos[posicao[y]] = x
+                posicao[y] += 1
+
+        # Ordena a lista de cada vértice e junta as repetições (arestas paralelas) numa única entrada
+        self.inicio = array('i', [0])
+        self.vizinhos = array('i')
+        self.multiplicidade = array('i')
+        for i in range(n):
+            anterior = -1
+            for j in sorted(vizinhos[contagem[i]:contagem[i + 1]]):
+                if j == anterior:
+                    self.multiplicidade[-1] += 1
+                else:
+                    self.vizinhos.append(j)
+                    self.multiplicidade.append(1)
+                    anterior = j
+            self.inicio.append(len(self.vizinhos))
+
+    @classmethod
+    def from_grafo(cls, grafo):
+        '''
+        Converte para o formato CSR um Grafo representado por dicionário de arestas (Roteiro3) ou por matriz de adjacência (Roteiro5).
+        :param grafo: O grafo a ser convertido.
+        :return: Um novo GrafoCSR com os mesmos vértices e arestas.
+        '''
+        if hasattr(grafo, 'A'):
+            return cls(grafo.N, grafo.A, getattr(grafo, 'P', None))
+
+        csr = cls(grafo.N)
+        origens = array('i')
+        destinos = array('i')
+        for i in range(len(grafo.M)):
+            linha = grafo.M[i]
+            for j in range(i, len(linha)):
+                for _ in range(int(linha[j])):
+                    origens.append(i)
+                    destinos.append(j)
+        csr.__constroi(origens, destinos)
+        return csr
+
+    def to_grafo(self, classe):
+        '''
+        Converte o grafo para uma das representações originais.
+        :param classe: A classe Grafo de destino: a de dicionário de arestas (Roteiro3) ou a de matriz de adjacência (Roteiro5).
+        Quando a classe de destino usa dicionário de arestas, as arestas mantêm os nomes, o sentido e os pesos guardados, se houver,
+        ou recebem os nomes a1, a2, ...
+        :return: Um novo objeto da classe passada com os mesmos vértices e arestas.
+        '''
+        vazio = classe()
+        if hasattr(vazio, 'M'):
+            n = len(self.N)
+            M = []
+            for i in range(n):
+                M.append([GrafoCSR.SEPARADOR_ARESTA] * i + [0] * (n - i))
+            for i, j, m in self.__arestas_indices():
+                M[i][j] = m
+            return classe(list(self.N), M)
+
+        A = {}
+        P = {}
+        for i, j, m in self.__arestas_indices():
+            aresta = self.N[i] + GrafoCSR.SEPARADOR_ARESTA + self.N[j]
+            for _ in range(m):
+                k = len(A)
+                if self.nomes_arestas is None:
+                    A['a' + str(k + 1)] = aresta
+                else:
+                    nome = self.nomes_arestas[k]
+                    P[nome] = self.pesos[k]
+                    A[nome] = self.N[j] + GrafoCSR.SEPARADOR_ARESTA + self.N[i] if self.invertidas[k] else aresta
+        if P and hasattr(vazio, 'P'):
+            return classe(list(self.N), A, P)
+        return classe(list(self.N), A)
+
+    def salva(self, caminho):
+        '''
+        Grava o grafo num arquivo binário compacto, que pode ser aberto depois com GrafoCSR.abre sem ser interpretado nem copiado.
+        O arquivo contém um cabeçalho seguido, cada seção alinhada em 8 bytes, dos arrays inicio, vizinhos e multiplicidade,
+        da tabela de nomes dos vértices (offsets, índices em ordem de nome e bytes em UTF-8) e, se houver, da tabela de nomes
+        das arestas (offsets e bytes), do sentido das arestas e dos pesos. Os números são gravados na ordem de bytes da máquina.
+        :param caminho: O caminho do arquivo a ser gravado.
+        '''
+        nomes_vertices = [v.encode('utf-8') for v in self.N]
+        ordem = array('i', sorted(range(len(nomes_vertices)), key=nomes_vertices.__getitem__))
+        nomes_arestas = []
+        tipo_pesos = 'd'
+        if self.nomes_arestas is not None:
+            nomes_arestas = [nome.encode('utf-8') for nome in self.nomes_arestas]
+            # Depois de abre os pesos são uma memoryview, que informa o tipo em format em vez de typecode
+            tipo_pesos = self.pesos.typecode if isinstance(self.pesos, array) else self.pesos.format
+
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(GrafoCSR.CABECALHO_ARQUIVO.pack(
+                GrafoCSR.ASSINATURA_ARQUIVO, GrafoCSR.VERSAO_ARQUIVO, 1 if sys.byteorder == 'little' else 2,
+                len(self.N), len(self.vizinhos), -1 if self.nomes_arestas is None else len(nomes_arestas),
+                sum(map(len, nomes_vertices)), sum(map(len, nomes_arestas)),
+                tipo_pesos.encode()))
+            GrafoCSR.__grava_secao(arquivo, array('q', self.inicio))
+            GrafoCSR.__grava_secao(arquivo, array('i', self.vizinhos))
+            GrafoCSR.__grava_secao(arquivo, array('i', self.multiplicidade))
+            GrafoCSR.__grava_tabela(arquivo, nomes_vertices)
+            GrafoCSR.__grava_secao(arquivo, ordem)
+            if self.nomes_arestas is not None:
+                GrafoCSR.__grava_tabela(arquivo, nomes_arestas)
+                GrafoCSR.__grava_secao(arquivo, array('B', self.invertidas))
+                GrafoCSR.__grava_secao(arquivo, array(tipo_pesos, self.pesos))
+
+    @staticmethod
+    def __grava_secao(arquivo, dados):
+        '''
+        Grava um array ou um bytes no arquivo e completa com zeros até o próximo múltiplo de 8 bytes.
+        '''
+        if isinstance(dados, array):
+            dados.tofile(arquivo)
+            tamanho = len(dados) * dados.itemsize
+        else:
+            arquivo.write(dados)
+            tamanho = len(dados)
+        arquivo.write(bytes(-tamanho % 8))
+
+    @staticmethod
+    def __grava_tabela(arquivo, nomes):
+        '''
+        Grava uma tabela de strings já codificadas: os offsets de cada uma e depois os bytes de todas, concatenados.
+        '''
+        offsets = array('q', [0])
+        for nome in nomes:
+            offsets.append(offsets[-1] + len(nome))
+        GrafoCSR.__grava_secao(arquivo, offsets)
+        GrafoCSR.__grava_secao(arquivo, b''.join(nomes))
+
+    @classmethod
+    def abre(cls, caminho):
+        '''
+        Abre um grafo gravado com salva, mapeando o arquivo na memória com mmap.
+        Os arrays e as tabelas de nomes passam a ser vistas (memoryview) sobre o arquivo, então nada é interpretado nem copiado
+        na abertura; as consultas leem só as páginas que usam. Os vértices são localizados por busca binária na tabela de nomes.
+        O arquivo fica aberto até fecha ser chamado (ou até o fim de um bloco with).
+        :param caminho: O caminho do arquivo.
+        :return: Um GrafoCSR somente leitura apoiado no arquivo.
+        :raises: ArquivoInvalidoException se o arquivo não estiver no formato esperado.
+        '''
+        with open(caminho, 'rb') as arquivo:
+            # mmap não aceita arquivos vazios
+            if os.fstat(arquivo.fileno()).st_size < GrafoCSR.CABECALHO_ARQUIVO.size:
+                raise ArquivoInvalidoException('O arquivo ' + caminho + ' não contém um GrafoCSR')
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        visao = memoryview(mapa)
+        try:
+            cabecalho = GrafoCSR.CABECALHO_ARQUIVO
+            assinatura, versao, ordem_bytes, n, qtde_vizinhos, qtde_arestas, bytes_vertices, bytes_arestas, tipo_pesos = \
+                cabecalho.unpack_from(visao)
+            if assinatura != GrafoCSR.ASSINATURA_ARQUIVO or versao != GrafoCSR.VERSAO_ARQUIVO or tipo_pesos not in (b'q', b'd'):
+                raise ArquivoInvalidoException('O arquivo ' + caminho + ' não contém um GrafoCSR')
+            if ordem_bytes != (1 if sys.byteorder == 'little' else 2):
+                raise ArquivoInvalidoException('O arquivo ' + caminho + ' foi gravado com outra ordem de bytes')
+
+            secoes = []
+            posicao = cabecalho.size
+            formatos = [('q', n + 1), ('i', qtde_vizinhos), ('i', qtde_vizinhos), ('q', n + 1), ('B', bytes_vertices), ('i', n)]
+            if qtde_arestas >= 0:
+                formatos += [('q', qtde_arestas + 1), ('B', bytes_arestas), ('B', qtde_arestas), (tipo_pesos.decode(), qtde_arestas)]
+            for formato, quantidade in formatos:
+                tamanho = quantidade * struct.calcsize(formato)
+                if posicao + tamanho > len(visao):
+                    raise ArquivoInvalidoException('O arquivo ' + caminho + ' está incompleto')
+                secoes.append(visao[posicao:posicao + tamanho].cast(formato))
+                posicao += tamanho + (-tamanho % 8)
+        except Exception:
+            visao.release()
+            mapa.close()
+            raise
+
+        grafo = cls.__new__(cls)
+        grafo.inicio, grafo.vizinhos, grafo.multiplicidade = secoes[0:3]
+        grafo.N = _TabelaNomes(secoes[4], secoes[3])
+        grafo.__indice = _IndiceNomes(grafo.N, secoes[5])
+        grafo.nomes_arestas = None
+        grafo.pesos = None
+        grafo.invertidas = None
+        if qtde_arestas >= 0:
+            grafo.nomes_arestas = _TabelaNomes(secoes[7], secoes[6])
+            grafo.invertidas, grafo.pesos = secoes[8:10]
+        grafo.__arquivo = (mapa, visao, secoes)
+        grafo.__primeira_aresta = None
+        return grafo
+
+    def fecha(self):
+        '''
+        Libera o arquivo mapeado por abre. Depois disso o grafo não pode mais ser consultado.
+        Não faz nada se o grafo não tiver sido aberto de um arquivo.
+        '''
+        if self.__arquivo is None:
+            return
+        mapa, visao, secoes = self.__arquivo
+        self.__arquivo = None
+        for secao in secoes:
+            secao.release()
+        visao.release()
+        mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fecha()
+
+    def __arestas_indices(self):
+        '''
+        Gera cada par de vértices adjacentes uma única vez, como (i, j, multiplicidade) com i <= j.
+        '''
+        for i in range(len(self.N)):
+            for k in range(self.inicio[i], self.inicio[i + 1]):
+                j = self.vizinhos[k]
+                if i <= j:
+                    yield i, j, self.multiplicidade[k]
+
+    def existeVertice(self, vertice: str):
+        '''
+        Verifica se um vértice passado como parâmetro pertence ao grafo.
+        :param vertice: O vértice que deve ser verificado.
+        :return: Um valor booleano que indica se o vértice existe no grafo.
+        '''
+        return vertice in self.__indice
+
+    def existeAresta(self, a: str):
+        '''
+        Verifica se uma aresta passada como parâmetro pertence ao grafo, com uma busca binária na lista de vizinhos.
+        :param a: A aresta a ser verificada
+        :return: Um valor booleano que indica se a aresta existe no grafo.
+        '''
+        x, separador, y = a.partition(GrafoCSR.SEPARADOR_ARESTA)
+        if not separador or x not in self.__indice or y not in self.__indice:
+            return False
+
+        i, j = self.__indice[x], self.__indice[y]
+        fim = self.inicio[i + 1]
+        k = bisect_left(self.vizinhos, j, self.inicio[i], fim)
+        return k < fim and self.vizinhos[k] == j
+
+    def __indice_existente(self, v):
+        '''
+        Dado um vértice, retorna o seu índice na lista de vértices.
+        :raises: VerticeInvalidoException se o vértice não pertencer ao grafo.
+        '''
+        if v not in self.__indice:
+            raise VerticeInvalidoException('O vértice ' + str(v) + ' não pertence ao grafo')
+        return self.__indice[v]
+
+    def grau(self, v):
+        '''
+        Fornece o grau de um vértice. Um laço contribui com 2 para o grau do seu vértice.
+        '''
+        i = self.__indice_existente(v)
+        grau = 0
+        for k in range(self.inicio[i], self.inicio[i + 1]):
+            grau += self.multiplicidade[k] * (2 if self.vizinhos[k] == i else 1)
+        return grau
+
+    def vertices_adjacentes(self, v):
+        '''
+        Fornece os vizinhos de um vértice, um para cada aresta. Um laço faz o próprio vértice aparecer duas vezes.
+        '''
+        i = self.__indice_existente(v)
+        resultado = []
+        for k in range(self.inicio[i], self.inicio[i + 1]):
+            j = self.vizinhos[k]
+            resultado.extend([self.N[j]] * (self.multiplicidade[k] * (2 if j == i else 1)))
+        return resultado
+
+    def dfs(self, r):
+        return list(self.percurso_dfs(r))
+
+    def __nome_aresta(self, u, k):
+        '''
+        Fornece o nome da aresta representada pela entrada k de vizinhos, que está na lista do vértice de índice u.
+        Com nomes_arestas, é o nome da primeira aresta do par de vértices; sem ele, a aresta no formato X-Y, com X sendo o vértice
+        que aparece primeiro na lista de vértices.
+        '''
+        w = self.vizinhos[k]
+        if self.nomes_arestas is None:
+            return self.N[min(u, w)] + GrafoCSR.SEPARADOR_ARESTA + self.N[max(u, w)]
+        return self.nomes_arestas[self.__vetor_primeira_aresta()[k]]
+
+    def __vetor_primeira_aresta(self):
+        '''
+        Associa cada entrada de vizinhos à posição, em nomes_arestas, da primeira aresta do seu par de vértices, calculando o
+        vetor apenas na primeira vez. Os nomes estão agrupados por par na ordem de __arestas_indices, então a posição das
+        entradas com i <= j é a soma das multiplicidades das anteriores; as entradas com i > j copiam a da entrada espelhada, já
+        calculada na lista de j.
+        '''
+        if self.__primeira_aresta is None:
+            primeira = array('i', bytes(4 * len(self.vizinhos)))
+            total = 0
+            for i in range(len(self.N)):
+                for k in range(self.inicio[i], self.inicio[i + 1]):
+                    j = self.vizinhos[k]
+                    if i <= j:
+                        primeira[k] = total
+                        total += self.multiplicidade[k]
+                    else:
+                        primeira[k] = primeira[bisect_left(self.vizinhos, i, self.inicio[j], self.inicio[j + 1])]
+            self.__primeira_aresta = primeira
+        return self.__primeira_aresta
+
+    def percurso_dfs(self, r):
+        '''
+        Percorre o grafo em profundidade a partir de um vértice usando uma pilha explícita, sem recursão.
+        As arestas são representadas pelo nome, quando o grafo guarda nomes_arestas, como no Grafo de origem, ou no formato X-Y,
+        com X sendo o vértice que aparece primeiro na lista de vértices.
+        :param r: O vértice raiz do percurso.
+        :return: Um gerador com a raiz seguida, para cada vértice descoberto, da aresta usada para alcançá-lo e do próprio vértice.
+        '''
+        i = self.__indice_existente(r)
+        yield r
+        visitados = bytearray(len(self.N))
+        visitados[i] = 1
+        pilha = [(i, self.inicio[i])]
+        while pilha:
+            u, k = pilha[-1]
+            fim = self.inicio[u + 1]
+            while k < fim and visitados[self.vizinhos[k]]:
+                k += 1
+            if k == fim:
+                pilha.pop()
+                continue
+            pilha[-1] = (u, k + 1)
+            w = self.vizinhos[k]
+            visitados[w] = 1
+            yield self.__nome_aresta(u, k)
+            yield self.N[w]
+            pilha.append((w, self.inicio[w]))
+
+    def __str__(self):
+        '''
+        Fornece uma representação do tipo String do grafo.
+        O String contém um sequência dos vértices separados por vírgula, seguido de uma sequência das arestas no formato padrão.
+        :return: Uma string que representa o grafo
+        '''
+        arestas = []
+        for i, j, m in self.__arestas_indices():
+            arestas.extend([self.N[i] + GrafoCSR.SEPARADOR_ARESTA + self.N[j]] * m)
+        return ', '.join(self.N) + '\n' + ', '.join(arestas)